@@ -16,6 +16,12 @@ glyphs_path = cache_path / "glyphs"
 # Create glyphs directory
 os.makedirs(glyphs_path, exist_ok=True)
 
+# Define results path
+results_path = cache_path / "results"
+
+# Create results directory
+os.makedirs(results_path, exist_ok=True)
+
 # Define debug path
 debug_path = cache_path / "debug"
 
@@ -3,7 +3,6 @@ from pathlib import Path
 
 import wx
 
-from autosheet.app import operations
 from autosheet.utils import paths, strings
 
 
@@ -63,6 +62,13 @@ class Window(wx.Frame):
         version_label.SetFont(font)
         vbox.Add(version_label, flag=wx.ALIGN_CENTER | wx.TOP, border=5)
 
+        # Create status label, showing when the models are ready
+        self.status_label = wx.StaticText(self.panel, label=strings.STATUS_LABEL_WARMING_UP)
+        font = self.status_label.GetFont()
+        font.PointSize -= 2
+        self.status_label.SetFont(font)
+        vbox.Add(self.status_label, flag=wx.ALIGN_CENTER | wx.TOP, border=5)
+
         # Add stretch spacer
         vbox.AddStretchSpacer()
 
@@ -130,6 +136,16 @@ class Window(wx.Frame):
 
         wx.CallAfter(self.panel.Layout)
 
+    def show_ready(self, error: BaseException | None = None) -> None:
+        """
+        Show that the models are ready, or why they failed to load.
+        """
+        if error is None:
+            self.status_label.SetLabel(strings.STATUS_LABEL_READY)
+        else:
+            self.status_label.SetLabel(strings.STATUS_LABEL_FAILED + str(error))
+        self.panel.Layout()
+
     def on_select_image_btn_clicked(self, _: wx.Event) -> None:
         """
         Open the file dialog when the "Select Image" button is clicked.
@@ -170,6 +186,9 @@ class Window(wx.Frame):
         """
         Perform the operations in a separate thread.
         """
+        # The operations pull in OpenCV and the OCR models, so they load after the window shows
+        from autosheet.app import operations
+
         try:
             # Show the steps label and the gauge
             wx.CallAfter(self.steps_label.Show)
@@ -179,6 +198,11 @@ class Window(wx.Frame):
 
             # Step 1: Load the image
             wx.CallAfter(self.steps_label.SetLabel, strings.STEPS_LABEL_1_LOADING)
+            key = operations.get_result_key(image_path)
+            self.pdf_path = operations.find_cached_datasheet(key)
+            if self.pdf_path is not None:
+                self.show_result()
+                return
             raw_image_name, raw_image = operations.load_image(image_path)
             wx.CallAfter(self.gauge.SetValue, 25)
             wx.CallAfter(self.panel.Layout)
@@ -200,24 +224,32 @@ class Window(wx.Frame):
             # Step 4: Find datasheet
             wx.CallAfter(self.steps_label.SetLabel, strings.STEPS_LABEL_4_FINDING)
             self.pdf_path = operations.find_datasheet(raw_image_text, processed_image_text)
-            wx.CallAfter(self.gauge.SetValue, 100)
-            wx.CallAfter(self.panel.Layout)
+            operations.cache_datasheet(
+                key, processed_image, raw_image_text, processed_image_text, self.pdf_path
+            )
 
             # Done
-            wx.CallAfter(self.steps_label.SetLabel, strings.STEPS_LABEL_5_DONE)
-            wx.CallAfter(
-                self.result_label.SetLabel, f"{strings.RESULT_LABEL_DONE}{self.pdf_path.stem}"
-            )
-            wx.CallAfter(self.open_datasheet_btn.Enable)
-            wx.CallAfter(self.panel.Layout)
+            self.show_result()
         except Exception as e:
             # Show the error message
             wx.CallAfter(self.set_initial_state)
             wx.CallAfter(wx.MessageBox, str(e), strings.ERROR_DIALOG_TITLE, wx.ICON_ERROR | wx.OK)
 
+    def show_result(self) -> None:
+        """
+        Show the found datasheet.
+        """
+        wx.CallAfter(self.gauge.SetValue, 100)
+        wx.CallAfter(self.steps_label.SetLabel, strings.STEPS_LABEL_5_DONE)
+        wx.CallAfter(self.result_label.SetLabel, f"{strings.RESULT_LABEL_DONE}{self.pdf_path.stem}")
+        wx.CallAfter(self.open_datasheet_btn.Enable)
+        wx.CallAfter(self.panel.Layout)
+
     def on_open_datasheet_btn_clicked(self, _: wx.Event) -> None:
         """
         Open the datasheet when the "Open Datasheet" button is clicked.
         """
         if self.pdf_path is not None:
+            from autosheet.app import operations
+
             operations.open_datasheet(self.pdf_path)
@@ -0,0 +1,151 @@
+import csv
+import json
+from pathlib import Path
+
+from autosheet.app import operations
+from autosheet.app.pipeline import Pipeline, Stage
+from autosheet.utils import constants, strings
+
+RESULT_FIELDS: list[str] = [
+    "image",
+    "name",
+    "raw_text",
+    "processed_text",
+    "datasheet",
+    "path",
+    "error",
+]
+
+
+def run_batch(
+    folder: Path, output: Path, workers: int = constants.BATCH_WORKERS
+) -> list[dict[str, str]]:
+    """
+    Find the datasheets for every image in the folder and write the results to the output file.
+    """
+    image_paths = get_image_paths(folder)
+    pipeline = get_pipeline(workers)
+    results = []
+
+    # Write each result as soon as its image is done
+    with open(output, "w", newline="") as f:
+        write_result = _get_result_writer(f, output)
+        for job, error in pipeline.run({"image": str(path)} for path in image_paths):
+            result = {field: job.get(field, "") for field in RESULT_FIELDS}
+            if error is not None:
+                result["error"] = str(error)
+            write_result(result)
+            results.append(result)
+            print(
+                strings.IMAGE_RESULT_REPORT.format(
+                    result["image"], result["datasheet"] or result["error"]
+                )
+            )
+
+    # Report how each stage kept up
+    for stats in pipeline.get_stats():
+        print(strings.BATCH_STAGE_REPORT.format(**stats))
+
+    # Return the results
+    return results
+
+
+def get_pipeline(workers: int = constants.BATCH_WORKERS) -> Pipeline:
+    """
+    Get a pipeline running the operations on jobs. Loading and matching touch shared files and
+    caches so they run on one thread, preprocessing runs on a process pool and text is
+    recognized by as many threads as there are OCR readers.
+    """
+    return Pipeline(
+        [
+            Stage("load", _load_image),
+            Stage("process", _process_image, workers, processes=True),
+            Stage("recognize", _recognize_text, constants.OCR_READERS),
+            Stage("find", _find_datasheet),
+        ]
+    )
+
+
+def get_image_paths(folder: Path) -> list[Path]:
+    """
+    Get the paths of the images in the folder, sorted by name.
+    """
+    return sorted(
+        path
+        for path in folder.iterdir()
+        if path.is_file() and path.suffix.lower() in constants.IMAGE_SUFFIXES
+    )
+
+
+def _load_image(job: dict) -> dict:
+    """
+    Step 1: Load the image of the job, or its cached datasheet.
+    """
+    image_path = Path(job["image"])
+    job["key"] = operations.get_result_key(image_path)
+    pdf_path = operations.find_cached_datasheet(job["key"])
+    if pdf_path is not None:
+        result = operations.get_cached_result(job["key"])
+        job["name"] = operations.get_image_name(image_path) or ""
+        job["raw_text"] = result.raw_text
+        job["processed_text"] = result.processed_text
+        job["datasheet"] = pdf_path.stem
+        job["path"] = str(pdf_path)
+        return job
+    job["name"], job["raw_image"] = operations.load_image(image_path)
+    return job
+
+
+def _process_image(job: dict) -> dict:
+    """
+    Step 2: Process the image of the job.
+    """
+    if "raw_image" in job:
+        job["processed_image"] = operations.process_image(job["name"], job["raw_image"])
+    return job
+
+
+def _recognize_text(job: dict) -> dict:
+    """
+    Step 3: Recognize the text of the job.
+    """
+    if "raw_image" in job:
+        job["raw_text"], job["processed_text"] = operations.recognize_text(
+            job.pop("raw_image"), job["processed_image"]
+        )
+    return job
+
+
+def _find_datasheet(job: dict) -> dict:
+    """
+    Step 4: Find the datasheet of the job and cache it.
+    """
+    if "processed_image" in job:
+        pdf_path = operations.find_datasheet(job["raw_text"], job["processed_text"])
+        operations.cache_datasheet(
+            job["key"], job.pop("processed_image"), job["raw_text"], job["processed_text"], pdf_path
+        )
+        job["datasheet"] = pdf_path.stem
+        job["path"] = str(pdf_path)
+    return job
+
+
+def _get_result_writer(f, output: Path):
+    """
+    Get a function writing one result to the file as a CSV row or a JSON line.
+    """
+    if output.suffix.lower() == ".csv":
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+
+        def write_csv(result: dict[str, str]) -> None:
+            writer.writerow(result)
+            f.flush()
+
+        return write_csv
+
+    def write_json(result: dict[str, str]) -> None:
+        f.write(json.dumps(result) + "\n")
+        f.flush()
+
+    return write_json
@@ -0,0 +1,64 @@
+import json
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode
+
+from autosheet.utils import constants
+
+SERVER_URL: str = f"http://{constants.SERVE_HOST}:{constants.SERVE_PORT}"
+
+
+def get_status(url: str = SERVER_URL) -> dict:
+    """
+    Get the status of the server, telling if its models are loaded.
+    """
+    return _request(f"{url}/status")
+
+
+def request_match(
+    image_path: Path, url: str = SERVER_URL, limit: int = constants.MATCH_RANKS
+) -> dict:
+    """
+    Send the image to the server and get its ranked datasheets.
+    """
+    query = urlencode({"name": image_path.name, "limit": limit})
+    return _request(f"{url}/match?{query}", image_path.read_bytes())
+
+
+def request_matches(
+    image_paths: list[Path], url: str = SERVER_URL, limit: int = constants.MATCH_RANKS
+) -> list[dict]:
+    """
+    Send the images to the server at once, so it recognizes them in shared batches, and get
+    their ranked datasheets in the same order. A failed image gets its error instead.
+    """
+
+    def match(image_path: Path) -> dict:
+        try:
+            return request_match(image_path, url, limit)
+        except (OSError, RuntimeError) as e:
+            return {"error": str(e)}
+
+    with ThreadPoolExecutor(max_workers=constants.OCR_BATCH_SIZE) as executor:
+        return list(executor.map(match, image_paths))
+
+
+def _request(url: str, data: bytes | None = None) -> dict:
+    """
+    Send a request to the server and decode its JSON response, raising the server error if
+    the request failed.
+    """
+    request = urllib.request.Request(url, data=data)
+    if data is not None:
+        request.add_header("Content-Type", "application/octet-stream")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.load(e)["error"]
+        except (ValueError, KeyError):
+            message = str(e)
+        raise RuntimeError(message) from e
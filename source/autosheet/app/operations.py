@@ -7,10 +7,59 @@ import numpy as np
 from PIL import Image
 
 from autosheet.core import match, process, recognition
-from autosheet.data import image
-from autosheet.utils import paths
+from autosheet.data import image, results
+from autosheet.data.models.Result import Result
+from autosheet.utils import constants, paths, profiling
 
 
+def get_result_key(image_path: Path) -> str:
+    """
+    Get the key identifying the result of the image with the current configuration.
+    """
+    return results.get_key(image.get_image_hash(image_path))
+
+
+def get_cached_result(key: str) -> Result | None:
+    """
+    Get the analysis of an image that was already analyzed.
+    """
+    return results.get_result(key)
+
+
+def find_cached_datasheet(key: str) -> Path | None:
+    """
+    Find the datasheet path of an image that was already analyzed.
+    """
+    result = get_cached_result(key)
+    if result is None:
+        return None
+
+    # Return the datasheet path if it still exists
+    pdf_path = paths.get_path(paths.PDFS_FOLDER / f"{result.datasheet}.pdf")
+    return pdf_path if pdf_path.exists() else None
+
+
+def cache_datasheet(
+    key: str,
+    processed_image: np.ndarray,
+    raw_image_text: str,
+    processed_image_text: str,
+    pdf_path: Path,
+) -> None:
+    """
+    Cache the analysis of an image so that it is not repeated.
+    """
+    results.add_result(key, processed_image, raw_image_text, processed_image_text, pdf_path.stem)
+
+
+def get_image_name(image_path: Path) -> str | None:
+    """
+    Get the name of the copy of an image that was already loaded.
+    """
+    return image.get_image_name(image_path)
+
+
+@profiling.profiled("load")
 def load_image(image_path: Path) -> tuple[str, Image.Image]:
     """
     Copy and load the image from the given path.
@@ -36,17 +85,31 @@ def find_datasheet(raw_image_text: str, processed_image_text: str) -> Path:
     """
     Find the datasheet path from the recognized text.
     """
-    raw_matched_name, raw_distance = match.get_match(raw_image_text)
-    processed_matched_name, processed_distance = match.get_match(processed_image_text)
+    return find_datasheets(raw_image_text, processed_image_text, 1)[0][0]
 
-    # Select the best match
-    if raw_distance < processed_distance:
-        pdf_name = raw_matched_name
-    else:
-        pdf_name = processed_matched_name
 
-    # Return the datasheet path
-    return paths.get_path(paths.PDFS_FOLDER / f"{pdf_name}.pdf")
+def find_datasheets(
+    raw_image_text: str, processed_image_text: str, limit: int = constants.MATCH_RANKS
+) -> list[tuple[Path, float]]:
+    """
+    Find the closest datasheet paths from the recognized text with their distances, from the
+    closest up.
+    """
+    raw_matches = match.get_ranked_matches(raw_image_text, limit)
+    processed_matches = match.get_ranked_matches(processed_image_text, limit)
+
+    # Keep the best distance of each datasheet, the processed text winning ties
+    distances = dict(processed_matches)
+    for pdf_name, distance in raw_matches:
+        if distance < distances.get(pdf_name, float("inf")):
+            distances[pdf_name] = distance
+
+    # Return the datasheet paths of the best matches
+    ranked_names = sorted(distances, key=distances.get)[:limit]
+    return [
+        (paths.get_path(paths.PDFS_FOLDER / f"{pdf_name}.pdf"), distances[pdf_name])
+        for pdf_name in ranked_names
+    ]
 
 
 def open_datasheet(pdf_path: Path) -> None:
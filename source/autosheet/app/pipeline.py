@@ -0,0 +1,239 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import util
+from typing import Any
+
+from autosheet.data import debug
+from autosheet.utils import constants, profiling
+
+_DONE = object()
+
+
+class Stage:
+    """
+    A step of the pipeline, run by its own workers and fed by its own bounded queue.
+    """
+
+    def __init__(
+        self, name: str, function: Callable[[Any], Any], workers: int = 1, processes: bool = False
+    ) -> None:
+        """
+        Initialize a Stage object. With processes, the function runs on a process pool and
+        must be picklable, as must its input and output.
+        """
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.processes = processes
+
+        # Run state and statistics
+        self.queue: queue.Queue | None = None
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset the run state and statistics of the stage.
+        """
+        self.count = 0
+        self.busy_time = 0.0
+        self.max_queue_depth = 0
+        self.workers_done = 0
+
+    def to_dict(self, elapsed: float) -> dict:
+        """
+        Convert the Stage statistics to a dictionary.
+        """
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "count": self.count,
+            "throughput": self.count / elapsed if elapsed > 0 else 0.0,
+            "utilization": self.busy_time / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class Pipeline:
+    """
+    Runs items through stages concurrently, so that a slow stage is overlapped by the others.
+    Queues between stages are bounded, so a slow stage holds back the ones feeding it.
+    """
+
+    def __init__(self, stages: list[Stage], capacity: int = constants.PIPELINE_CAPACITY) -> None:
+        """
+        Initialize a Pipeline object.
+        """
+        self.stages = stages
+        self.capacity = capacity
+        self.started_at: float | None = None
+        self.output: queue.Queue | None = None
+        self.error: BaseException | None = None
+        self.lock = threading.Lock()
+
+    def run(self, items: Iterable[Any]) -> Iterator[tuple[Any, Exception | None]]:
+        """
+        Run the items through every stage and yield each output as soon as it is done, along
+        with the error that stopped it early, if any. An error reading the items or killing a
+        worker is raised once the outputs are through.
+        """
+        self.started_at = time.perf_counter()
+        self.output = queue.Queue()
+        self.error = None
+        pools: list[ProcessPoolExecutor] = []
+
+        # Create the bounded input queue of every stage
+        for stage in self.stages:
+            stage.reset()
+            stage.queue = queue.Queue(maxsize=self.capacity)
+        next_stages = self.stages[1:] + [None]
+
+        try:
+            # Start the workers of every stage
+            for position, stage in enumerate(self.stages):
+                pool = None
+                if stage.processes:
+                    pool = ProcessPoolExecutor(
+                        stage.workers,
+                        initializer=_init_worker,
+                        initargs=(
+                            constants.DEBUG,
+                            constants.DEBUG_SAMPLING,
+                            constants.PROCESS_PROFILE,
+                            constants.PROFILE,
+                        ),
+                    )
+                    pools.append(pool)
+                for _ in range(stage.workers):
+                    threading.Thread(
+                        target=self._work, args=(stage, pool, next_stages[position]), daemon=True
+                    ).start()
+
+            # Feed the items from a separate thread so outputs can be yielded meanwhile
+            feeder = threading.Thread(target=self._feed, args=(items,), daemon=True)
+            feeder.start()
+
+            # Yield the outputs until every item is through
+            while (result := self.output.get()) is not _DONE:
+                yield result
+
+            # Raise the error that stopped the feeder or a worker
+            if self.error is not None:
+                raise self.error
+        finally:
+            for pool in pools:
+                pool.shutdown(cancel_futures=True)
+
+    def get_stats(self) -> list[dict]:
+        """
+        Get the throughput, utilization and queue depth of every stage.
+        """
+        elapsed = time.perf_counter() - self.started_at if self.started_at is not None else 0.0
+        return [stage.to_dict(elapsed) for stage in self.stages]
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        """
+        Put the items into the first stage, blocking while it is full. The end of the input is
+        put even if reading the items fails, so the run does not wait forever.
+        """
+        try:
+            for item in items:
+                self._put(self.stages[0], (item, None))
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._put(self.stages[0], _DONE)
+
+    def _work(
+        self, stage: Stage, pool: ProcessPoolExecutor | None, next_stage: Stage | None
+    ) -> None:
+        """
+        Run the stage on items from its queue until the end of the input is reached. A worker
+        stopped by an error beyond its items still counts as done, so the run does not wait
+        forever.
+        """
+        reached_end = False
+        try:
+            while (entry := stage.queue.get()) is not _DONE:
+                item, error = entry
+
+                # Failed items skip the remaining stages
+                if error is None:
+                    started_at = time.perf_counter()
+                    try:
+                        if pool is not None:
+                            future = pool.submit(_call_in_worker, stage.function, item)
+                            item, records = future.result()
+                            profiling.add_records(records)
+                        else:
+                            item = stage.function(item)
+                    except Exception as e:
+                        error = e
+                    with stage.lock:
+                        stage.count += 1
+                        stage.busy_time += time.perf_counter() - started_at
+
+                self._put(next_stage, (item, error))
+            reached_end = True
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            # The last worker to finish ends the input of the next stage
+            with stage.lock:
+                stage.workers_done += 1
+                last = stage.workers_done == stage.workers
+            if last:
+                self._put(next_stage, _DONE)
+
+            # Let the other workers of this stage see the end of the input too
+            elif reached_end:
+                stage.queue.put(_DONE)
+
+    def _fail(self, error: BaseException) -> None:
+        """
+        Keep the first error that stopped the feeder or a worker, to raise it from the run.
+        """
+        with self.lock:
+            if self.error is None:
+                self.error = error
+
+    def _put(self, stage: Stage | None, entry: Any) -> None:
+        """
+        Put an entry into the queue of a stage, or into the output after the last stage.
+        """
+        if stage is None:
+            self.output.put(entry)
+            return
+
+        # Block while the stage is full and track its depth
+        stage.queue.put(entry)
+        with stage.lock:
+            stage.max_queue_depth = max(stage.max_queue_depth, stage.queue.qsize())
+
+
+def _init_worker(
+    debug_images: bool, debug_sampling: int, process_profile: str, profile: bool
+) -> None:
+    """
+    Carry the settings given on the command line over to the worker processes.
+    """
+    constants.DEBUG = debug_images
+    constants.DEBUG_SAMPLING = debug_sampling
+    constants.PROCESS_PROFILE = process_profile
+
+    # Worker processes skip atexit, so save their queued debug images when they shut down
+    if debug_images:
+        util.Finalize(None, debug.flush_debug_images, exitpriority=0)
+    if profile:
+        profiling.enable()
+
+
+def _call_in_worker(function: Callable[[Any], Any], item: Any) -> tuple[Any, list[dict]]:
+    """
+    Call the function in a worker process and send its profiling records back with the result.
+    """
+    return function(item), profiling.pop_records()
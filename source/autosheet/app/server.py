@@ -0,0 +1,255 @@
+import json
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from autosheet.app import operations, warmup
+from autosheet.core import recognition
+from autosheet.utils import constants, strings
+
+# Loading copies the image into the images folder and finding writes the shared caches, so each
+# runs for one request at a time, like the batch pipeline runs them on one thread. The distance
+# table holds its own lock, which the warm-up shares, so cached results do not race its build
+_LOAD_LOCK: threading.Lock = threading.Lock()
+_FIND_LOCK: threading.Lock = threading.Lock()
+
+
+class Batcher:
+    """
+    Collects the images of concurrent requests into shared OCR calls. A batch starts with the
+    first waiting request and takes the requests arriving within the wait, up to the batch size.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = constants.OCR_BATCH_SIZE,
+        wait: float = constants.SERVE_BATCH_WAIT,
+        workers: int = constants.OCR_READERS,
+    ) -> None:
+        """
+        Initialize a Batcher object with one thread per OCR reader.
+        """
+        self.batch_size = batch_size
+        self.wait = wait
+        self.requests: queue.Queue = queue.Queue()
+        for _ in range(workers):
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def recognize(self, images: list[np.ndarray]) -> list[str]:
+        """
+        Recognize the text of the images together with the images of other requests.
+        """
+        future = Future()
+        self.requests.put((images, future))
+        return future.result()
+
+    def _run(self) -> None:
+        """
+        Recognize the waiting requests batch by batch.
+        """
+        while True:
+            # Wait for a request, then for more until the batch is full or the wait is over
+            batch = [self.requests.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.wait
+            while size < self.batch_size:
+                try:
+                    batch.append(self.requests.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+                size += len(batch[-1][0])
+
+            # Recognize the images of every request at once
+            try:
+                texts = recognition.get_recognitions(
+                    [image for images, _ in batch for image in images]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            # Give each request its texts back
+            start = 0
+            for images, future in batch:
+                future.set_result(texts[start : start + len(images)])
+                start += len(images)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    Answers the requests of the server: GET /status tells if the models are loaded, and
+    POST /match takes an image as the request body and returns its ranked datasheets.
+    """
+
+    server: "Server"
+
+    def do_GET(self) -> None:
+        """
+        Handle a GET request.
+        """
+        if urlparse(self.path).path != "/status":
+            self._send_json(404, {"error": strings.SERVE_ERROR_NOT_FOUND})
+            return
+        error = warmup.get_error()
+        self._send_json(
+            200, {"ready": warmup.is_ready(), "error": None if error is None else str(error)}
+        )
+
+    def do_POST(self) -> None:
+        """
+        Handle a POST request.
+        """
+        url = urlparse(self.path)
+        if url.path != "/match":
+            self._send_json(404, {"error": strings.SERVE_ERROR_NOT_FOUND})
+            return
+
+        # Read the image and the options
+        query = parse_qs(url.query)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            limit = int(query.get("limit", [constants.MATCH_RANKS])[0])
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        if length <= 0:
+            self._send_json(400, {"error": strings.SERVE_ERROR_NO_IMAGE})
+            return
+        if length > constants.SERVE_MAX_UPLOAD_BYTES:
+            self._send_json(
+                413,
+                {"error": strings.SERVE_ERROR_TOO_LARGE.format(constants.SERVE_MAX_UPLOAD_BYTES)},
+            )
+            return
+        body = self.rfile.read(length)
+        if len(body) < length:
+            self._send_json(400, {"error": strings.SERVE_ERROR_INCOMPLETE})
+            return
+        suffix = Path(query.get("name", [""])[0]).suffix or f".{constants.IMAGE_FORMAT}"
+
+        # Find the datasheets of the image
+        try:
+            result = self.server.find_datasheets(body, suffix, max(1, limit))
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+            return
+        self._send_json(200, result)
+
+    def log_message(self, format: str, *args) -> None:
+        """
+        Log the requests only in debug mode.
+        """
+        if constants.DEBUG:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, data: dict) -> None:
+        """
+        Send the data as a JSON response.
+        """
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Server(ThreadingHTTPServer):
+    """
+    A local HTTP server keeping the OCR models, the distance tables and the datasheet index
+    loaded, so that several clients share them. Each request runs on its own thread and their
+    images are recognized in shared batches.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]) -> None:
+        """
+        Initialize a Server object listening on the address.
+        """
+        super().__init__(address, Handler)
+        self.batcher = Batcher()
+
+    def find_datasheets(self, data: bytes, suffix: str, limit: int) -> dict:
+        """
+        Find the ranked datasheets of an uploaded image, going through the same steps and caches
+        as the application.
+        """
+        # Write the upload to a file, which the operations work on
+        with tempfile.TemporaryDirectory() as folder:
+            image_path = Path(folder) / f"upload{suffix}"
+            image_path.write_bytes(data)
+
+            # Step 1: Load the image, unless it was already analyzed
+            with _LOAD_LOCK:
+                key = operations.get_result_key(image_path)
+                result = operations.get_cached_result(key)
+                if result is None:
+                    name, raw_image = operations.load_image(image_path)
+                else:
+                    name = operations.get_image_name(image_path) or ""
+
+        # Reuse the recognized text of an image that was already analyzed
+        if result is not None:
+            raw_text, processed_text = result.raw_text, result.processed_text
+        else:
+            # Step 2: Process the image
+            processed_image = operations.process_image(name, raw_image)
+
+            # Step 3: Recognize the text along with the images of other requests
+            raw_text, processed_text = self.batcher.recognize(
+                [np.array(raw_image), processed_image]
+            )
+
+        # Step 4: Rank the datasheets and cache the best one
+        with _FIND_LOCK:
+            pdf_matches = operations.find_datasheets(raw_text, processed_text, limit)
+            if result is None:
+                operations.cache_datasheet(
+                    key, processed_image, raw_text, processed_text, pdf_matches[0][0]
+                )
+
+        # Return the best datasheet and the ranking
+        return {
+            "image": name,
+            "raw_text": raw_text,
+            "processed_text": processed_text,
+            "datasheet": pdf_matches[0][0].stem,
+            "path": str(pdf_matches[0][0]),
+            "matches": [
+                {"datasheet": pdf_path.stem, "path": str(pdf_path), "distance": distance}
+                for pdf_path, distance in pdf_matches
+            ],
+            "cached": result is not None,
+        }
+
+
+def run_server(host: str = constants.SERVE_HOST, port: int = constants.SERVE_PORT) -> None:
+    """
+    Load the models and serve requests until interrupted.
+    """
+    server = Server((host, port))
+    print(strings.SERVE_LISTENING_REPORT.format(host, server.server_port))
+
+    # Load everything the first request needs while the server already accepts requests
+    warmup.start_warm_up(
+        lambda error: print(
+            strings.STATUS_LABEL_READY
+            if error is None
+            else strings.STATUS_LABEL_FAILED + str(error)
+        )
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
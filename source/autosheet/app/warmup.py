@@ -0,0 +1,80 @@
+import threading
+from collections.abc import Callable
+
+from autosheet.utils import constants, profiling
+
+_READY: threading.Event = threading.Event()
+_THREAD: threading.Thread | None = None
+_ERROR: BaseException | None = None
+
+
+def start_warm_up(on_done: Callable[[BaseException | None], None] | None = None) -> None:
+    """
+    Warm up in a background thread, calling on_done with the error, if any, once done.
+    """
+    global _THREAD
+
+    # Warm up only once
+    if _THREAD is not None:
+        return
+
+    def run() -> None:
+        global _ERROR
+
+        try:
+            warm_up()
+        except Exception as e:
+            _ERROR = e
+        finally:
+            _READY.set()
+        if on_done is not None:
+            on_done(_ERROR)
+
+    _THREAD = threading.Thread(target=run, daemon=True)
+    _THREAD.start()
+
+
+def is_ready() -> bool:
+    """
+    Check if the warm-up is done.
+    """
+    return _READY.is_set()
+
+
+def get_error() -> BaseException | None:
+    """
+    Get the error the warm-up failed with, if any.
+    """
+    return _ERROR
+
+
+@profiling.profiled("warm_up")
+def warm_up() -> None:
+    """
+    Load everything the first image needs, so it is as fast as the ones after it: the heavy
+    modules, the glyph atlas and distance tables, the datasheet index, the match store and the
+    OCR models, which also run once on a blank image.
+    """
+    # Import the operations, which pull in OpenCV, PIL and NumPy
+    with profiling.profile("warm_up.import"):
+        import numpy as np
+
+        from autosheet.app import operations  # noqa: F401
+        from autosheet.core import distance, glyph, index, match, recognition
+        from autosheet.data import matches
+
+    # Load the glyph masks and the distance table, filling in any missing distance
+    with profiling.profile("warm_up.distance"):
+        glyph.get_distance_masks([""] + list(constants.ALPHABET))
+        distance.warm_distance_table()
+
+    # Build the datasheet index, open the match store and run the matching kernel once
+    with profiling.profile("warm_up.match"):
+        index.get_candidates("")
+        matches.get_matches("")
+        match.warm_up()
+
+    # Load the OCR models and run them on a blank image, which also warms up torch
+    with profiling.profile("warm_up.recognize"):
+        recognition.warm_up()
+        recognition.get_recognitions([np.zeros((64, 256, 3), dtype=np.uint8)])
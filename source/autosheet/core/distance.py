@@ -1,43 +1,287 @@
-import cv2
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import numpy as np
 
 from autosheet.core import glyph
-from autosheet.data import distances
+from autosheet.data import debug, distances, tables
 from autosheet.data.models.Distance import Distance
-from autosheet.utils import chars, constants, paths
+from autosheet.utils import chars, constants, paths, profiling
+
+EMPTY_CODE: int = 0
+
+_CODES: dict[str, int] | None = None
+_GLYPHS: list[str] | None = None
+_TABLE: np.ndarray | None = None
+
+# The table is built, grown and filled by the warm-up and the request threads alike, so every
+# access to it and to the glyph codes holds the lock
+_LOCK: threading.RLock = threading.RLock()
 
 
 def get_distance(g1: str, g2: str) -> float:
     """
     Get the distance between two grayscale images.
     """
-    cache = distances.get_distances()
+    return get_distance_by_code(get_code(g1), get_code(g2))
+
+
+def get_distance_by_code(c1: int, c2: int) -> float:
+    """
+    Get the distance between two glyphs by their integer codes.
+    """
+    with _LOCK:
+        table = get_distance_table()
+
+        # Lookup the distance in the table
+        distance = table[c1, c2]
+        if not np.isnan(distance):
+            return float(distance)
+
+        # Compute the missing distance and store it in the table
+        return _add_distance(_GLYPHS[c1], _GLYPHS[c2])
+
+
+def get_distance_matrix(codes1: np.ndarray, codes2: np.ndarray) -> np.ndarray:
+    """
+    Get the distances between two sequences of glyph codes as a (len1, len2) matrix.
+    """
+    with _LOCK:
+        table = get_distance_table()
+        matrix = table[np.ix_(codes1, codes2)]
+
+        # Compute the missing distances in one batch
+        if np.isnan(matrix).any():
+            codes = dict.fromkeys(np.concatenate((codes1, codes2)).tolist())
+            table = warm_distance_table([_GLYPHS[c] for c in codes])
+            matrix = table[np.ix_(codes1, codes2)]
+
+    # Return the distance matrix
+    return matrix
+
+
+def get_code(glyph: str) -> int:
+    """
+    Get the integer code of a glyph, registering the glyph if it is new.
+    """
+    with _LOCK:
+        get_distance_table()
+
+        # Return the known code
+        if glyph in _CODES:
+            return _CODES[glyph]
+
+        # Register the glyph and grow the table if needed
+        code = len(_GLYPHS)
+        _CODES[glyph] = code
+        _GLYPHS.append(glyph)
+        _ensure_capacity(code + 1)
+        return code
+
+
+def get_codes(text: str) -> np.ndarray:
+    """
+    Get the integer codes of each glyph in the text.
+    """
+    with _LOCK:
+        return np.array([get_code(g) for g in text], dtype=np.intp)
+
+
+def get_distance_table() -> np.ndarray:
+    """
+    Get the dense glyph distance table. Missing distances are NaN.
+    """
+    global _CODES, _GLYPHS, _TABLE
+
+    with _LOCK:
+        # Return the table if it is already built
+        if _TABLE is not None:
+            return _TABLE
+
+        # Index the empty glyph and the supported alphabet, other glyphs are registered on use
+        glyphs = [""] + list(constants.ALPHABET)
+        codes = {g: code for code, g in enumerate(glyphs)}
+
+        # Fill the empty glyph and the alphabet from the compiled table, the distances of other
+        # glyphs are looked up in the cache when they are first needed
+        table = np.full((len(glyphs), len(glyphs)), np.nan)
+        compiled_table = get_compiled_table()
+        table[: len(compiled_table), : len(compiled_table)] = compiled_table
+
+        # Publish the table once it is complete, so a failed build is retried
+        _GLYPHS, _CODES, _TABLE = glyphs, codes, table
+        return _TABLE
+
+
+def get_compiled_table() -> np.ndarray:
+    """
+    Get the compiled distance table between the empty glyph and the alphabet selected by
+    constants.DISTANCE_TABLE: the table of one font, or the min or mean across every font.
+    """
+    font_names = get_table_fonts()
+    font_tables = build_font_tables(font_names)
+    return _aggregate_distances(np.stack([font_tables[name] for name in font_names]))
+
+
+def get_table_fonts() -> list[str]:
+    """
+    Get the fonts the selected distance table is computed from.
+    """
+    return tables.get_table_fonts()
+
+
+@profiling.profiled("distance.build")
+def build_font_tables(
+    font_names: list[str] | None = None, workers: int = constants.BATCH_WORKERS
+) -> dict[str, np.ndarray]:
+    """
+    Get the compiled distance table of every font, defaulting to constants.FONT_NAMES. Only
+    fonts without a compiled table are built, in parallel, so adding a font does not rebuild
+    the others.
+    """
+    font_names = font_names or constants.FONT_NAMES
+    level = constants.DISTANCE_LEVEL
+    dtype = constants.DISTANCE_DTYPE
+
+    # Load the compiled tables
+    font_tables = {}
+    for font_name in font_names:
+        table = tables.load_table(font_name, level, dtype)
+        if table is not None:
+            font_tables[font_name] = table
+    missing = [font_name for font_name in font_names if font_name not in font_tables]
+
+    # Build the missing tables, one process per font when there are several
+    if len(missing) == 1:
+        built_tables = [_compile_font_table(missing[0], level, dtype)]
+    elif missing:
+        with ProcessPoolExecutor(min(workers, len(missing))) as pool:
+            built_tables = list(
+                pool.map(_compile_font_table, missing, repeat(level), repeat(dtype))
+            )
+    else:
+        built_tables = []
+
+    # Save the built tables
+    for font_name, table in zip(missing, built_tables):
+        tables.save_table(font_name, table, level, dtype)
+        font_tables[font_name] = table
+
+    # Return the tables of every font
+    return font_tables
+
+
+@profiling.profiled("distance.warm")
+def warm_distance_table(glyphs: list[str] | None = None) -> np.ndarray:
+    """
+    Compute every missing distance between the given glyphs in one batch.
+    Defaults to the empty glyph and the supported alphabet.
+    """
+    if glyphs is None:
+        glyphs = [""] + list(constants.ALPHABET)
+
+    with _LOCK:
+        return _warm_distance_table(glyphs)
+
+
+def _warm_distance_table(glyphs: list[str]) -> np.ndarray:
+    """
+    Compute every missing distance between the glyphs, holding the lock.
+    """
+    # Nothing to do if every pair is already known
+    codes = np.array([get_code(g) for g in glyphs], dtype=np.intp)
+    table = get_distance_table()
+    missing = np.isnan(table[np.ix_(codes, codes)])
+    if not missing.any():
+        return table
+
+    # Look the missing distances up in the cache first
+    for i, j in zip(*np.nonzero(np.triu(missing))):
+        cached = distances.get_distance(min(glyphs[i], glyphs[j]), max(glyphs[i], glyphs[j]))
+        if cached is not None:
+            table[codes[i], codes[j]] = cached.distance
+            table[codes[j], codes[i]] = cached.distance
+            missing[i, j] = missing[j, i] = False
+    if not missing.any():
+        return table
+
+    # Compute the pairwise distances of all glyphs in every font of the table
+    matrix = _aggregate_distances(
+        np.stack(
+            [
+                _compute_distance_matrix(glyphs, glyph.get_distance_masks(glyphs, font_name=f))
+                for f in get_table_fonts()
+            ]
+        )
+    )
+
+    # Add the missing distances to the table and the cache
+    new_distances = []
+    rows, cols = np.nonzero(np.triu(missing))
+    for i, j in zip(rows, cols):
+        distance = matrix[i, j]
+        table[codes[i], codes[j]] = distance
+        table[codes[j], codes[i]] = distance
+        subject = min(glyphs[i], glyphs[j])
+        target = max(glyphs[i], glyphs[j])
+        new_distances.append((subject, Distance(target, float(distance))))
+    distances.add_distances(new_distances)
+
+    # Return the warmed table
+    return table
+
+
+def _ensure_capacity(size: int) -> None:
+    """
+    Grow the distance table so it can hold at least the given number of glyphs, holding the
+    lock.
+    """
+    global _TABLE
+
+    # Nothing to do if the table is large enough
+    if size <= _TABLE.shape[0]:
+        return
 
+    # Double the capacity to amortize the growth
+    capacity = max(size, 2 * _TABLE.shape[0])
+    table = np.full((capacity, capacity), np.nan)
+    table[: _TABLE.shape[0], : _TABLE.shape[1]] = _TABLE
+    _TABLE = table
+
+
+def _add_distance(g1: str, g2: str) -> float:
+    """
+    Get the distance between two glyphs from the cache, or compute it and add it to the cache,
+    and add it to the table, holding the lock.
+    """
     # Ensure the subject is always the lexicographically smaller glyph
     subject = min(g1, g2)
     target = max(g1, g2)
+    c1 = _CODES[g1]
+    c2 = _CODES[g2]
 
-    # If the subject is not in the cache, add it
-    if subject not in cache:
-        cache[subject] = []
-
-    # Lookup the distance in the cache
-    for distance in cache[subject]:
-        if distance.target == target:
-            return distance.distance
+    # Add the cached distance to the table
+    cached = distances.get_distance(subject, target)
+    if cached is not None:
+        _TABLE[c1, c2] = cached.distance
+        _TABLE[c2, c1] = cached.distance
+        return cached.distance
 
-    # Get the masks for the two glyphs
-    m1 = glyph.get_glyph_mask(g1)
-    m2 = glyph.get_glyph_mask(g2)
+    # Compute the distance between the two images in every font of the table
+    font_distances = []
+    for font_name in get_table_fonts():
+        m1 = glyph.get_distance_mask(g1, font_name=font_name)
+        m2 = glyph.get_distance_mask(g2, font_name=font_name)
+        font_distances.append(_compute_distance(g1, m1, g2, m2))
+    distance = float(_aggregate_distances(np.array(font_distances)))
 
-    # Compute the distance between the two images and save it to the cache
-    distance = _compute_distance(g1, m1, g2, m2)
+    # Add the distance to the table
+    _TABLE[c1, c2] = distance
+    _TABLE[c2, c1] = distance
 
     # Add the target distance to the cache
-    cache[subject].append(Distance(target, distance))
-
-    # Save the updated cache
-    distances.save_distances()
+    distances.add_distances([(subject, Distance(target, distance))])
 
     # Return the computed distance
     return distance
@@ -45,24 +289,100 @@ def get_distance(g1: str, g2: str) -> float:
 
 def _compute_distance(g1: str, m1: np.ndarray, g2: str, m2: np.ndarray) -> float:
     """
-    Computes a per-pixel absolute distance between two grayscale images.
+    Computes a per-pixel absolute distance between two grayscale images. Distances of reduced
+    masks are scaled up to approximate the full-resolution ones.
     """
-    distance = np.abs(m1 - m2)
-    total_distance = distance.sum()
+    distance = _get_difference(m1, m2)
+    total_distance = distance.sum(dtype=np.float64) * _get_scale(m1)
 
     # Save the difference image to the debug folder
     if constants.DEBUG:
-        glyph1_name = chars.get_safe_name(g1)
-        glyph2_name = chars.get_safe_name(g2)
-        cv2.imwrite(
-            str(
-                paths.get_path(
-                    paths.DEBUG_DISTANCED_FOLDER
-                    / f"{glyph1_name}---{glyph2_name}.{constants.IMAGE_FORMAT}"
-                )
-            ),
-            distance,
-        )
+        _debug_distance(g1, g2, distance)
 
     # Return the average difference
     return total_distance
+
+
+def _compute_distance_matrix(glyphs: list[str], masks: np.ndarray) -> np.ndarray:
+    """
+    Computes the per-pixel absolute distance between every pair of stacked masks.
+    Rows are processed in chunks so the broadcasted differences stay bounded in memory.
+    """
+    count = masks.shape[0]
+    flat = masks.reshape(count, -1)
+    scale = _get_scale(masks[0])
+    matrix = np.zeros((count, count))
+
+    # Get the number of rows that fit in a chunk
+    row_bytes = count * flat.shape[1] * flat.itemsize
+    chunk_size = max(1, constants.DISTANCE_CHUNK_BYTES // row_bytes)
+
+    # Compute the upper triangle chunk by chunk
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+        differences = _get_difference(flat[start:stop, None, :], flat[None, start:, :])
+        matrix[start:stop, start:] = differences.sum(axis=2, dtype=np.float64) * scale
+
+        # Save the difference images to the debug folder
+        if constants.DEBUG:
+            for i in range(start, stop):
+                for j in range(i, count):
+                    difference = differences[i - start, j - start].reshape(masks.shape[1:])
+                    _debug_distance(glyphs[i], glyphs[j], difference)
+
+    # Mirror the upper triangle
+    return np.triu(matrix) + np.triu(matrix, 1).T
+
+
+def _compile_font_table(font_name: str, level: int, dtype: str) -> np.ndarray:
+    """
+    Compute the distance table between the empty glyph and the alphabet in the font.
+    """
+    glyphs = [""] + list(constants.ALPHABET)
+    masks = glyph.get_distance_masks(glyphs, level, dtype, font_name)
+    return _compute_distance_matrix(glyphs, masks)
+
+
+def _aggregate_distances(font_distances: np.ndarray) -> np.ndarray:
+    """
+    Aggregate the distances computed in each font of the table along the first axis.
+    """
+    match constants.DISTANCE_TABLE:
+        case "min":
+            return font_distances.min(axis=0)
+        case "mean":
+            return font_distances.mean(axis=0)
+        case _:
+            return font_distances[0]
+
+
+def _get_difference(m1: np.ndarray, m2: np.ndarray) -> np.ndarray:
+    """
+    Get the per-pixel absolute difference of the masks in their own dtype. Unsigned masks are
+    subtracted from larger to smaller so they never wrap around.
+    """
+    if np.issubdtype(m1.dtype, np.unsignedinteger):
+        return np.maximum(m1, m2) - np.minimum(m1, m2)
+    return np.abs(m1 - m2)
+
+
+def _get_scale(mask: np.ndarray) -> float:
+    """
+    Get the factor scaling a distance between reduced masks up to the full canvas.
+    """
+    return (constants.CANVAS_SIZE / mask.shape[-1]) ** 2
+
+
+def _debug_distance(g1: str, g2: str, distance: np.ndarray) -> None:
+    """
+    Save the difference image of two glyphs to the debug folder, keeping every Nth pair.
+    """
+    glyph1_name = chars.get_safe_name(g1)
+    glyph2_name = chars.get_safe_name(g2)
+    debug.save_debug_image(
+        paths.get_path(
+            paths.DEBUG_DISTANCED_FOLDER / f"{glyph1_name}---{glyph2_name}.{constants.IMAGE_FORMAT}"
+        ),
+        distance,
+        constants.DEBUG_SAMPLING,
+    )
@@ -3,13 +3,89 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFilter
 from PIL.ImageFont import FreeTypeFont
 
-from autosheet.data import font
+from autosheet.data import atlas
+from autosheet.data.font import get_font
 from autosheet.utils import chars, constants, paths
 
+_MASKS: dict[tuple[str, str], np.ndarray] = {}
+_DISTANCE_MASKS: dict[tuple[str, str, int, str], np.ndarray] = {}
 
-def get_glyph_mask(glyph: str) -> np.ndarray:
+
+def get_glyph_mask(glyph: str, font_name: str | None = None) -> np.ndarray:
+    """
+    Get the blurred mask for a given glyph. Masks of the default font are cached in the atlas
+    and the glyphs folder for future use, masks of other fonts are rendered. Every mask is kept
+    in memory.
+    """
+    font_name = font_name or constants.FONT_NAME
+
+    # Return the mask from memory if it is already loaded
+    if (font_name, glyph) in _MASKS:
+        return _MASKS[(font_name, glyph)]
+
+    # Load the mask from the atlas, then from the glyphs folder, rendering it as a last resort
+    if font_name == constants.FONT_NAME:
+        code = _get_code_point(glyph)
+        mask = atlas.get_atlas_mask(code)
+        if mask is None:
+            mask = _load_glyph_mask(glyph)
+            atlas.add_atlas_mask(code, mask)
+    else:
+        mask = _render_glyph_mask(glyph, font=get_font(font_name))
+
+    # Keep the mask in memory, read-only since every caller shares it
+    mask = mask.astype("float")
+    mask.flags.writeable = False
+    _MASKS[(font_name, glyph)] = mask
+    return mask
+
+
+def get_distance_mask(
+    glyph: str, level: int | None = None, dtype: str | None = None, font_name: str | None = None
+) -> np.ndarray:
+    """
+    Get the mask of the glyph as distances are computed: halved level times with pyramid steps
+    and stored in the dtype. Defaults to constants.DISTANCE_LEVEL, constants.DISTANCE_DTYPE and
+    constants.FONT_NAME.
+    """
+    level = constants.DISTANCE_LEVEL if level is None else level
+    dtype = dtype or constants.DISTANCE_DTYPE
+    font_name = font_name or constants.FONT_NAME
+
+    # Return the mask from memory if it is already reduced
+    key = (font_name, glyph, level, dtype)
+    if key in _DISTANCE_MASKS:
+        return _DISTANCE_MASKS[key]
+
+    # Halve the resolution once per pyramid level
+    mask = get_glyph_mask(glyph, font_name)
+    for _ in range(level):
+        mask = cv2.pyrDown(mask)
+
+    # Round before storing the mask as integers
+    if np.issubdtype(dtype, np.integer):
+        mask = np.rint(mask)
+    mask = mask.astype(dtype)
+    mask.flags.writeable = False
+    _DISTANCE_MASKS[key] = mask
+    return mask
+
+
+def get_distance_masks(
+    glyphs: list[str],
+    level: int | None = None,
+    dtype: str | None = None,
+    font_name: str | None = None,
+) -> np.ndarray:
+    """
+    Get the distance masks for the given glyphs stacked into a single (N, H, W) array.
+    """
+    return np.stack([get_distance_mask(glyph, level, dtype, font_name) for glyph in glyphs])
+
+
+def _load_glyph_mask(glyph: str) -> np.ndarray:
     """
-    Get the blurred mask for a given glyph. The mask is cached for future use.
+    Load the mask of the glyph from the glyphs folder, or render it and save it there.
     """
     path = paths.get_path(
         paths.GLYPHS_FOLDER / f"{chars.get_safe_name(glyph)}.{constants.IMAGE_FORMAT}"
@@ -17,7 +93,7 @@ def get_glyph_mask(glyph: str) -> np.ndarray:
 
     # Load the cached glyph if it exists
     if path.exists():
-        return cv2.imread(str(path), cv2.IMREAD_GRAYSCALE).astype("float")
+        return cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
 
     # Render the glyph and save it to the cache
     mask = _render_glyph_mask(glyph)
@@ -25,15 +101,24 @@ def get_glyph_mask(glyph: str) -> np.ndarray:
     return mask
 
 
+def _get_code_point(glyph: str) -> int:
+    """
+    Get the code point indexing the glyph in the atlas, 0 for the empty glyph.
+    """
+    return ord(glyph) if glyph else 0
+
+
 def _render_glyph_mask(
     glyph: str,
     size: int = constants.CANVAS_SIZE,
-    font: FreeTypeFont = font.get_font(),
+    font: FreeTypeFont | None = None,
     blur_radius: int = constants.BLUR_RADIUS,
 ) -> np.ndarray:
     """
-    Render a character as a blurred mask.
+    Render a character as a blurred mask. Defaults to the default font, loaded on first use.
     """
+    font = font or get_font()
+
     # Create a new grayscale image with a black background
     mask = Image.new("L", (size, size), 0)
     draw = ImageDraw.Draw(mask)
@@ -0,0 +1,97 @@
+import threading
+from collections import Counter
+
+from autosheet.data import pdfs
+from autosheet.utils import constants
+
+_NAMES: list[str | None] | None = None
+_POSITIONS: dict[str, int] = {}
+_NGRAMS: dict[str, list[int]] | None = None
+_LOCK: threading.Lock = threading.Lock()
+
+
+def get_candidates(subject: str, limit: int = constants.MATCH_CANDIDATES) -> list[str]:
+    """
+    Get the datasheet names sharing the most n-grams with the subject, in catalog order.
+    """
+    with _LOCK:
+        names, ngrams = _get_index()
+
+        # Nothing to prune if the catalog is small enough
+        if len(_POSITIONS) <= limit:
+            return [name for name in names if name is not None]
+
+        # Count the n-grams each name shares with the subject
+        scores = Counter()
+        for ngram in set(_get_ngrams(subject)):
+            scores.update(ngrams.get(ngram, []))
+
+        # Keep the best scoring names, breaking ties by catalog order
+        positions = sorted(_POSITIONS.values(), key=lambda i: (-scores[i], i))[:limit]
+        return [names[i] for i in sorted(positions)]
+
+
+def update_index(added: list[str], removed: list[str]) -> None:
+    """
+    Update the index with the names added to and removed from the catalog. Added names are
+    indexed at the end and removed names leave an empty position, so the catalog order holds.
+    """
+    with _LOCK:
+        # Nothing to update if the index was never built
+        if _NAMES is None:
+            return
+
+        # Remove the names from the n-gram lists
+        for name in removed:
+            position = _POSITIONS.pop(name, None)
+            if position is None:
+                continue
+            _NAMES[position] = None
+            for ngram in set(_get_ngrams(name)):
+                _NGRAMS[ngram].remove(position)
+
+        # Index the added names
+        for name in added:
+            if name not in _POSITIONS:
+                _add_name(name)
+
+
+def _get_index() -> tuple[list[str | None], dict[str, list[int]]]:
+    """
+    Get the n-gram inverted index over the datasheet names, following the catalog as it
+    changes.
+    """
+    global _NAMES, _NGRAMS
+
+    # Return the cached index if it exists
+    if _NAMES is not None:
+        return _NAMES, _NGRAMS
+
+    # Follow the catalog, the updates wait for the index to be built
+    pdfs.add_pdf_listener(update_index)
+
+    # Map every n-gram to the positions of the names containing it
+    _NAMES = []
+    _NGRAMS = {}
+    for name in pdfs.get_pdf_names():
+        _add_name(name)
+    return _NAMES, _NGRAMS
+
+
+def _add_name(name: str) -> None:
+    """
+    Index the name at the end of the catalog.
+    """
+    position = len(_NAMES)
+    _NAMES.append(name)
+    _POSITIONS[name] = position
+    for ngram in set(_get_ngrams(name)):
+        _NGRAMS.setdefault(ngram, []).append(position)
+
+
+def _get_ngrams(text: str, size: int = constants.NGRAM_SIZE) -> list[str]:
+    """
+    Get the character n-grams of the text, ignoring case.
+    """
+    text = text.upper()
+    return [text[i : i + size] for i in range(len(text) - size + 1)]
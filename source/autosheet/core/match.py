@@ -1,58 +1,112 @@
-from autosheet.core import distance
-from autosheet.data import matches, pdfs
+import bisect
+import math
+
+import numpy as np
+
+from autosheet.core import distance, index
+from autosheet.data import matches
 from autosheet.data.models.Match import Match
+from autosheet.utils import chars, constants, profiling
+
+BAND_TOLERANCE: float = 1e-9
 
 
 def get_match(subject: str) -> tuple[str, float]:
     """
-    Match the subject string to the closest targe string.
+    Match the subject string to the closest targe string. The subject is normalized first, so
+    whitespace and case do not change the match nor miss the cache.
+    """
+    return get_ranked_matches(subject, 1)[0]
+
+
+@profiling.profiled("match")
+def get_ranked_matches(subject: str, limit: int = constants.MATCH_RANKS) -> list[tuple[str, float]]:
+    """
+    Match the subject string to the closest target strings, returning up to limit targets with
+    their distances from the closest up. Only the distances that can still make the ranking are
+    computed in full.
     """
-    cache = matches.get_matches()
+    subject = chars.normalize_text(subject)
 
-    # Get the list of target strings
-    targets = pdfs.get_pdf_names()
+    # Get the list of candidate target strings
+    targets = index.get_candidates(subject)
     matching_results = {}
+    best_distances = []
+    new_matches = []
 
-    # If the subject is not in the cache, add it
-    if subject not in cache:
-        cache[subject] = []
+    # Get the cached distances of the subject
+    cached_distances = {match.target: match.distance for match in matches.get_matches(subject)}
 
-    # Compute the distance between the subject and each target
+    # Start from the cached distances to get a tight threshold early
     for target in targets:
-        # Lookup the match in the cache
-        found_in_cache = False
-        for match in cache[subject]:
-            if match.target == target:
-                matching_results[target] = match.distance
-                found_in_cache = True
-                break
-
-        # Skip the target if it is already in the cache
-        if found_in_cache:
-            continue
+        if target in cached_distances:
+            matching_results[target] = cached_distances[target]
+            _add_best_distance(best_distances, cached_distances[target], limit)
+
+    # Visit the remaining targets from the lowest lower bound up
+    lower_bounds = {
+        target: _compute_lower_bound(subject, target)
+        for target in targets
+        if target not in matching_results
+    }
+    for target in sorted(lower_bounds, key=lower_bounds.get):
+        # No remaining target can beat the last ranked distance
+        threshold = best_distances[-1] if len(best_distances) >= limit else float("inf")
+        if lower_bounds[target] > threshold:
+            break
 
-        # Compute the distance between the subject and the target
-        distance = _compute_min_distance(subject, target)
+        # Compute the distance, giving up once it exceeds the last ranked one
+        distance = _compute_min_distance(subject, target, threshold=threshold)
+        if distance == float("inf"):
+            continue
         matching_results[target] = distance
+        _add_best_distance(best_distances, distance, limit)
 
         # Add the match to the cache
-        cache[subject].append(Match(target, distance))
+        new_matches.append(Match(target, distance))
+
+    # Add the new matches to the cache
+    if new_matches:
+        matches.add_matches(subject, new_matches)
 
-    # Save the updated cache
-    matches.save_matches()
+    # Rank the targets by distance, breaking ties by catalog order
+    positions = {target: position for position, target in enumerate(targets)}
+    ranked_targets = sorted(matching_results, key=lambda t: (matching_results[t], positions[t]))
+    return [(target, matching_results[target]) for target in ranked_targets[:limit]]
 
-    # Find the target with the minimum distance
-    best_target = min(matching_results, key=matching_results.get)
-    return best_target, matching_results[best_target]
+
+def warm_up() -> None:
+    """
+    Run the matching kernel once, so the first subject is matched as fast as the ones after it.
+    """
+    _compute_min_distance(constants.ALPHABET[:4], constants.ALPHABET[:5])
 
 
-def _compute_min_distance(subject: str, target: str) -> float:
+def _add_best_distance(best_distances: list[float], distance: float, limit: int) -> None:
+    """
+    Add the distance to the sorted list of the best distances, keeping at most limit of them.
+    """
+    bisect.insort(best_distances, distance)
+    del best_distances[limit:]
+
+
+def _compute_min_distance(
+    subject: str,
+    target: str,
+    windowed: bool = constants.WINDOWED_MATCHING,
+    threshold: float = float("inf"),
+) -> float:
     """
     Compute the minimum distance between the subject and the target.
+    Returns infinity if the distance is known to exceed the threshold.
     """
     # Subject and target are the same length, compute the distance
     if len(subject) == len(target):
-        return _compute_levenshtein_distance(subject, target)
+        return _compute_weighted_levenshtein(subject, target, threshold=threshold)
+
+    # Align the shorter string anywhere inside the longer one
+    if not windowed:
+        return _compute_weighted_levenshtein(subject, target, free_ends=True, threshold=threshold)
     best_score = float("inf")
 
     # Subject is longer, window the target
@@ -64,7 +118,9 @@ def _compute_min_distance(subject: str, target: str) -> float:
             sub_subject = subject[i : i + window_size]
 
             # Compute the distance between the windowed subject and the target
-            score = _compute_levenshtein_distance(sub_subject, target)
+            score = _compute_weighted_levenshtein(
+                sub_subject, target, threshold=min(threshold, best_score)
+            )
             best_score = min(best_score, score)
 
     # Target is longer, window the subject
@@ -76,18 +132,52 @@ def _compute_min_distance(subject: str, target: str) -> float:
             sub_target = target[i : i + window_size]
 
             # Compute the distance between the subject and the windowed target
-            score = _compute_levenshtein_distance(subject, sub_target)
+            score = _compute_weighted_levenshtein(
+                subject, sub_target, threshold=min(threshold, best_score)
+            )
             best_score = min(best_score, score)
 
     return best_score
 
 
+def _compute_lower_bound(subject: str, target: str) -> float:
+    """
+    Compute a cheap lower bound of the minimum distance between the subject and the target.
+    Every glyph of the shorter string is either deleted or substituted by a glyph of the
+    longer one, and for equal lengths the same holds the other way around.
+    """
+    shorter, longer = sorted((subject, target), key=len)
+    if len(longer) == 0:
+        return 0.0
+
+    shorter_codes = distance.get_codes(shorter)
+    longer_codes = distance.get_codes(longer)
+    empty_codes = np.array([distance.EMPTY_CODE], dtype=np.intp)
+
+    # Get the cheapest way to align each glyph of the shorter string
+    substitution_costs = distance.get_distance_matrix(shorter_codes, longer_codes)
+    deletion_costs = distance.get_distance_matrix(shorter_codes, empty_codes)[:, 0]
+    lower_bound = np.minimum(deletion_costs, substitution_costs.min(axis=1)).sum()
+
+    # Gaps in the longer string are only paid for when both strings are aligned globally
+    if len(shorter) == len(longer):
+        insertion_costs = distance.get_distance_matrix(empty_codes, longer_codes)[0]
+        lower_bound = max(
+            lower_bound, np.minimum(insertion_costs, substitution_costs.min(axis=0)).sum()
+        )
+
+    return float(lower_bound)
+
+
 def _compute_levenshtein_distance(subject: str, target: str) -> float:
     """
     Compute the Levenshtein distance between subject and target using custom costs.
     Insertion and deletion costs are determined by comparing a character with an empty string.
-    Substitution cost is given by distance.get_distance for the two characters.
+    Substitution cost is given by the glyph distance table for the two characters.
     """
+    subject_codes = distance.get_codes(subject)
+    target_codes = distance.get_codes(target)
+    empty = distance.EMPTY_CODE
     m = len(subject)
     n = len(target)
 
@@ -97,20 +187,125 @@ def _compute_levenshtein_distance(subject: str, target: str) -> float:
     # Base cases using custom cost functions
     for i in range(1, m + 1):
         # Deletion: cost to delete subject[i-1] is cost of comparing it to an empty string.
-        dp[i][0] = dp[i - 1][0] + distance.get_distance(subject[i - 1], "")
+        dp[i][0] = dp[i - 1][0] + distance.get_distance_by_code(subject_codes[i - 1], empty)
 
     for j in range(1, n + 1):
         # Insertion: cost to insert target[j-1] is cost of comparing an empty string to it.
-        dp[0][j] = dp[0][j - 1] + distance.get_distance("", target[j - 1])
+        dp[0][j] = dp[0][j - 1] + distance.get_distance_by_code(empty, target_codes[j - 1])
 
     # Fill the DP matrix
     for i in range(1, m + 1):
         for j in range(1, n + 1):
-            deletion_cost = dp[i - 1][j] + distance.get_distance(subject[i - 1], "")
-            insertion_cost = dp[i][j - 1] + distance.get_distance("", target[j - 1])
-            substitution_cost = dp[i - 1][j - 1] + distance.get_distance(
-                subject[i - 1], target[j - 1]
+            deletion_cost = dp[i - 1][j] + distance.get_distance_by_code(
+                subject_codes[i - 1], empty
+            )
+            insertion_cost = dp[i][j - 1] + distance.get_distance_by_code(
+                empty, target_codes[j - 1]
+            )
+            substitution_cost = dp[i - 1][j - 1] + distance.get_distance_by_code(
+                subject_codes[i - 1], target_codes[j - 1]
             )
             dp[i][j] = min(deletion_cost, insertion_cost, substitution_cost)
 
     return dp[m][n]
+
+
+def _compute_weighted_levenshtein(
+    subject: str, target: str, free_ends: bool = False, threshold: float = float("inf")
+) -> float:
+    """
+    Compute the same distance as _compute_levenshtein_distance with a row-wise NumPy recurrence.
+    Only two rows of the DP matrix are kept, so memory is linear in the target length.
+    With free ends, leading and trailing gaps in the longer string cost nothing, so the
+    shorter string is matched against the best substring of the longer one.
+    Returns infinity if the distance exceeds the threshold. Row minimums never decrease, so
+    the DP stops as soon as one exceeds it, and without free ends only the diagonal band
+    that the threshold allows is filled.
+    """
+    # Costs are symmetric, so the longer string can always be laid along the row
+    if free_ends and len(subject) > len(target):
+        subject, target = target, subject
+    m = len(subject)
+    n = len(target)
+
+    subject_codes = distance.get_codes(subject)
+    target_codes = distance.get_codes(target)
+    empty_codes = np.array([distance.EMPTY_CODE], dtype=np.intp)
+
+    # Gather the costs from the glyph distance table
+    substitution_costs = distance.get_distance_matrix(subject_codes, target_codes)
+    deletion_costs = distance.get_distance_matrix(subject_codes, empty_codes)[:, 0]
+    insertion_costs = distance.get_distance_matrix(empty_codes, target_codes)[0]
+
+    # Get the diagonals that can be reached within the threshold
+    if free_ends:
+        lowest_diagonal, highest_diagonal = -m, n
+    else:
+        band = _compute_band(m, n, deletion_costs, insertion_costs, threshold)
+        if band is None:
+            return float("inf")
+        lowest_diagonal, highest_diagonal = band
+
+    # Cumulative insertion costs, which are also the first row of the DP matrix
+    insertion_offsets = np.zeros(n + 1)
+    np.cumsum(insertion_costs, out=insertion_offsets[1:])
+    previous = np.zeros_like(insertion_offsets) if free_ends else insertion_offsets.copy()
+    previous[max(0, highest_diagonal + 1) :] = np.inf
+    current = np.empty_like(previous)
+
+    # Fill the DP matrix row by row
+    for i in range(m):
+        # Get the band of columns in this row
+        low = max(0, i + 1 + lowest_diagonal)
+        high = min(n, i + 1 + highest_diagonal)
+        current.fill(np.inf)
+        if low > high:
+            return float("inf")
+
+        # Deletion and substitution only depend on the previous row
+        if low == 0:
+            current[0] = previous[0] + deletion_costs[i]
+        first = max(low, 1)
+        np.minimum(
+            previous[first : high + 1] + deletion_costs[i],
+            previous[first - 1 : high] + substitution_costs[i, first - 1 : high],
+            out=current[first : high + 1],
+        )
+
+        # Resolve the chain of insertions along the row with a running minimum
+        row = current[low : high + 1]
+        row -= insertion_offsets[low : high + 1]
+        np.minimum.accumulate(row, out=row)
+        row += insertion_offsets[low : high + 1]
+
+        # Give up once no alignment can stay within the threshold
+        if row.min() > threshold:
+            return float("inf")
+
+        # Swap the rows
+        previous, current = current, previous
+
+    # Trailing gaps are free, so the alignment can end anywhere in the row
+    result = previous.min() if free_ends else previous[-1]
+    return float(result) if result <= threshold else float("inf")
+
+
+def _compute_band(
+    m: int, n: int, deletion_costs: np.ndarray, insertion_costs: np.ndarray, threshold: float
+) -> tuple[int, int] | None:
+    """
+    Compute the lowest and highest diagonals (column minus row) a global alignment can use
+    without its indels alone exceeding the threshold, or None if no alignment can.
+    """
+    # Every alignment needs at least the length difference in indels
+    indel_cost = min(deletion_costs.min(initial=np.inf), insertion_costs.min(initial=np.inf))
+    if threshold == float("inf") or not indel_cost > 0:
+        return -m, n
+    # Widen the band by the rounding of the costs, so alignments on the threshold are kept
+    slack = threshold / indel_cost * (1 + BAND_TOLERANCE) - abs(n - m)
+    if slack < 0:
+        return None
+
+    # Leaving the diagonals between the corners costs two indels per step
+    extra = math.ceil(slack / 2)
+    return max(-m, min(0, n - m) - extra), min(n, max(0, n - m) + extra)
@@ -2,13 +2,18 @@ import cv2
 import numpy as np
 from PIL import Image
 
-from autosheet.utils import constants, paths
+from autosheet.data import debug
+from autosheet.utils import constants, paths, profiling
 
 
-def get_processed(name: str, image: Image.Image) -> np.ndarray:
+@profiling.profiled("process")
+def get_processed(name: str, image: Image.Image, profile: str | None = None) -> np.ndarray:
     """
-    Process the input image to extract text regions.
+    Process the input image to extract text regions. The profile trades accuracy for speed and
+    defaults to constants.PROCESS_PROFILE.
     """
+    profile = profile or constants.PROCESS_PROFILE
+
     # 1. Resize image
     resized_image = _resize_image(image)
     _debug_image(resized_image, name, 1)
@@ -26,7 +31,7 @@ def get_processed(name: str, image: Image.Image) -> np.ndarray:
     _debug_image(clahe_enhanced_image, name, 4)
 
     # 5. Denoise
-    denoised_image = _denoise_image(clahe_enhanced_image)
+    denoised_image = _denoise_image(clahe_enhanced_image, profile)
     _debug_image(denoised_image, name, 5)
 
     # 6. Invert image
@@ -48,6 +53,7 @@ def get_processed(name: str, image: Image.Image) -> np.ndarray:
     return deskewed_image
 
 
+@profiling.profiled("process.resize")
 def _resize_image(image: Image.Image) -> np.ndarray:
     """
     Resize the input image to a maximum width of 1024 pixels.
@@ -65,6 +71,7 @@ def _resize_image(image: Image.Image) -> np.ndarray:
     return np.array(resized_image)
 
 
+@profiling.profiled("process.grayscale")
 def _grayscale_image(image: np.ndarray) -> np.ndarray:
     """
     Convert the image from BGR to grayscale.
@@ -72,6 +79,7 @@ def _grayscale_image(image: np.ndarray) -> np.ndarray:
     return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
 
+@profiling.profiled("process.gamma")
 def _gamma_adjust_image(image: np.ndarray) -> np.ndarray:
     """
     Apply gamma correction to adjust image brightness.
@@ -83,6 +91,7 @@ def _gamma_adjust_image(image: np.ndarray) -> np.ndarray:
     return cv2.LUT(image, table)
 
 
+@profiling.profiled("process.clahe")
 def _clahe_enhance_image(gray_image: np.ndarray) -> np.ndarray:
     """
     Enhance contrast of a grayscale image using CLAHE.
@@ -91,13 +100,29 @@ def _clahe_enhance_image(gray_image: np.ndarray) -> np.ndarray:
     return clahe.apply(gray_image)
 
 
-def _denoise_image(image: np.ndarray) -> np.ndarray:
-    """
-    Remove noise from a grayscale image using fast non-local means denoising.
-    """
-    return cv2.fastNlMeansDenoising(image, None, h=10, templateWindowSize=7, searchWindowSize=15)
+@profiling.profiled("process.denoise")
+def _denoise_image(image: np.ndarray, profile: str = "accurate") -> np.ndarray:
+    """
+    Remove noise from a grayscale image. The accurate profile uses fast non-local means
+    denoising, the fast profile shrinks its search window and the realtime profile uses a
+    bilateral filter instead.
+    """
+    match profile:
+        case "accurate":
+            return cv2.fastNlMeansDenoising(
+                image, None, h=10, templateWindowSize=7, searchWindowSize=15
+            )
+        case "fast":
+            return cv2.fastNlMeansDenoising(
+                image, None, h=10, templateWindowSize=7, searchWindowSize=7
+            )
+        case "realtime":
+            return cv2.bilateralFilter(image, 9, 75, 75)
+        case _:
+            raise ValueError(f"Unknown preprocessing profile: {profile}")
 
 
+@profiling.profiled("process.invert")
 def _invert_image(image: np.ndarray) -> np.ndarray:
     """
     Invert a grayscale image.
@@ -105,6 +130,7 @@ def _invert_image(image: np.ndarray) -> np.ndarray:
     return cv2.bitwise_not(image)
 
 
+@profiling.profiled("process.binarize")
 def _binarize_image(image: np.ndarray) -> np.ndarray:
     """
     Convert an image to a binary image using adaptive thresholding.
@@ -119,6 +145,7 @@ def _binarize_image(image: np.ndarray) -> np.ndarray:
     )
 
 
+@profiling.profiled("process.clean")
 def _clean_image(image: np.ndarray) -> np.ndarray:
     """
     Perform morphological closing to connect text segments and reduce noise.
@@ -128,6 +155,7 @@ def _clean_image(image: np.ndarray) -> np.ndarray:
     return closed
 
 
+@profiling.profiled("process.deskew")
 def _deskew_image(image: np.ndarray) -> np.ndarray:
     """
     Deskew a rotated image using Hough line transform.
@@ -140,8 +168,7 @@ def _deskew_image(image: np.ndarray) -> np.ndarray:
 
     # Calculate the angle of rotation
     angles = []
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
+    for x1, y1, x2, y2 in lines.reshape(-1, 4):
         angle = np.degrees(np.arctan2((y2 - y1), (x2 - x1)))
         angles.append(angle)
 
@@ -183,9 +210,9 @@ def _debug_image(image: np.ndarray, name: str, step: int) -> None:
         case _:
             step_text = "unknown"
 
-    # Save the image
+    # Save the image in the background
     if constants.DEBUG:
-        cv2.imwrite(
+        debug.save_debug_image(
             paths.get_path(
                 paths.DEBUG_PROCESSED_FOLDER / f"{name}_{step}_{step_text}.{constants.IMAGE_FORMAT}"
             ),
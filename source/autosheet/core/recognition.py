@@ -1,13 +1,117 @@
-import easyocr
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
 import numpy as np
 
+from autosheet.utils import constants, profiling
+
+if TYPE_CHECKING:
+    import easyocr
+
+_READERS: queue.Queue = queue.Queue()
+_READERS_CREATED: int = 0
+_READERS_LOCK: threading.Lock = threading.Lock()
+
 
 def get_recognition(raw_image: np.ndarray, processed_image: np.ndarray) -> tuple[str, str]:
     """
     Get text recognition from raw and processed images.
     """
-    raw_image_texts = easyocr.Reader(["en"]).readtext(raw_image)
-    processed_image_texts = easyocr.Reader(["en"]).readtext(processed_image)
-    raw_image_text = " ".join([text[1] for text in raw_image_texts])
-    processed_image_text = " ".join([text[1] for text in processed_image_texts])
+    raw_image_text, processed_image_text = get_recognitions([raw_image, processed_image])
     return raw_image_text, processed_image_text
+
+
+@profiling.profiled("recognition")
+def get_recognitions(
+    images: list[np.ndarray], batch_size: int = constants.OCR_BATCH_SIZE
+) -> list[str]:
+    """
+    Get text recognition from several images at once, in the same order as the images.
+    Images of the same size go through the detector and the recognizer together.
+    """
+    images = [_to_color_image(image) for image in images]
+
+    # Group the images by size, since each detector batch is stacked into one tensor
+    groups: dict[tuple[int, ...], list[int]] = {}
+    for position, image in enumerate(images):
+        groups.setdefault(image.shape, []).append(position)
+
+    # Recognize each group in batches
+    texts = [""] * len(images)
+    with _borrow_reader() as reader:
+        for positions in groups.values():
+            for start in range(0, len(positions), batch_size):
+                batch = positions[start : start + batch_size]
+                if len(batch) == 1:
+                    results = [reader.readtext(images[batch[0]], batch_size=batch_size)]
+                else:
+                    results = reader.readtext_batched(
+                        [images[position] for position in batch], batch_size=batch_size
+                    )
+
+                # Join the recognized texts of each image
+                for position, result in zip(batch, results):
+                    texts[position] = " ".join([text[1] for text in result])
+
+    return texts
+
+
+@profiling.profiled("recognition.warm_up")
+def warm_up() -> None:
+    """
+    Load the OCR models ahead of the first recognition.
+    """
+    with _borrow_reader():
+        pass
+
+
+@contextmanager
+def _borrow_reader() -> Iterator["easyocr.Reader"]:
+    """
+    Borrow a reader from the pool, creating one if the pool is not full yet.
+    A reader is only used by one thread at a time.
+    """
+    global _READERS_CREATED
+
+    # Reserve a new reader if there is no idle one and the pool is not full
+    with _READERS_LOCK:
+        create = _READERS.empty() and _READERS_CREATED < constants.OCR_READERS
+        if create:
+            _READERS_CREATED += 1
+
+    # Create the reader outside of the lock, or wait for an idle one
+    if create:
+        try:
+            # EasyOCR loads torch, which takes seconds, so it is imported with the first reader
+            import easyocr
+
+            reader = easyocr.Reader(constants.OCR_LANGUAGES)
+        except BaseException:
+            with _READERS_LOCK:
+                _READERS_CREATED -= 1
+            raise
+    else:
+        reader = _READERS.get()
+
+    # Return the reader to the pool once done
+    try:
+        yield reader
+    finally:
+        _READERS.put(reader)
+
+
+def _to_color_image(image: np.ndarray) -> np.ndarray:
+    """
+    Convert the image to three channels the same way the reader does, so that images of the
+    same size can share a batch.
+    """
+    if image.ndim == 3 and image.shape[2] == 1:
+        image = image[:, :, 0]
+    if image.ndim == 2:
+        return np.repeat(image[:, :, np.newaxis], 3, axis=2)
+    if image.shape[2] == 4:
+        return np.ascontiguousarray(image[:, :, 2::-1])
+    return image
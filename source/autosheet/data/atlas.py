@@ -0,0 +1,136 @@
+import atexit
+import json
+
+import numpy as np
+
+from autosheet.data import font
+from autosheet.utils import constants, files, paths
+
+_ATLAS: np.ndarray | None = None
+_ROWS: dict[int, int] | None = None
+_PENDING: dict[int, np.ndarray] = {}
+
+
+def get_atlas_mask(code: int) -> np.ndarray | None:
+    """
+    Get the mask of the glyph with the code point from the atlas, if it is there.
+    """
+    _load_atlas()
+    if code in _PENDING:
+        return _PENDING[code]
+    if code in _ROWS:
+        return _ATLAS[_ROWS[code]]
+    return None
+
+
+def add_atlas_mask(code: int, mask: np.ndarray) -> None:
+    """
+    Add the mask of the glyph with the code point to the atlas. It is saved on the next flush.
+    """
+    _load_atlas()
+    if code not in _ROWS:
+        _PENDING[code] = mask.astype(np.uint8)
+
+
+def load_atlas() -> None:
+    """
+    Map the atlas from the cache again, dropping the added masks that were not saved.
+    """
+    global _ROWS
+
+    _ROWS = None
+    _PENDING.clear()
+    _load_atlas()
+
+
+def flush_atlas() -> None:
+    """
+    Save the atlas if masks were added to it.
+    """
+    if _PENDING:
+        save_atlas()
+
+
+def save_atlas() -> None:
+    """
+    Save every mask in the atlas as one (N, H, W) uint8 array, with the code point of each row
+    saved next to it.
+    """
+    global _ATLAS, _ROWS
+
+    # Nothing to save if the atlas was never loaded
+    if _ROWS is None:
+        return
+
+    # Append the added masks to the ones already in the atlas
+    codes = list(_ROWS) + list(_PENDING)
+    masks = [_ATLAS[row] for row in _ROWS.values()] + list(_PENDING.values())
+
+    # Keep the atlas in memory, releasing the mapped file before it is replaced
+    _ATLAS = np.stack(masks)
+
+    # Save the masks first so the codes never point past the end of the atlas
+    files.write_npy(paths.get_path(paths.GLYPH_ATLAS_FILE), _ATLAS)
+    files.write_npy(paths.get_path(paths.GLYPH_CODES_FILE), np.array(codes, dtype=np.int32))
+    _ROWS = {code: row for row, code in enumerate(codes)}
+    _PENDING.clear()
+
+
+def _load_atlas() -> None:
+    """
+    Memory-map the atlas from the cache, or start an empty one if it is missing or stale.
+    """
+    global _ATLAS, _ROWS
+
+    # Return if the atlas is already loaded
+    if _ROWS is not None:
+        return
+
+    # Discard the atlas and the rendered glyphs if the font or its settings changed
+    render_hash = font.get_render_hash()
+    if _load_render_hash() != render_hash:
+        _clear_glyphs(render_hash)
+
+    # Map the atlas without reading it, the masks are paged in when used
+    shape = (constants.CANVAS_SIZE, constants.CANVAS_SIZE)
+    try:
+        atlas = np.load(paths.get_path(paths.GLYPH_ATLAS_FILE), mmap_mode="r")
+        codes = np.load(paths.get_path(paths.GLYPH_CODES_FILE))
+        if atlas.shape[1:] != shape or len(codes) > len(atlas):
+            raise ValueError("Glyph atlas does not match the canvas")
+        _ATLAS = atlas
+        _ROWS = {int(code): row for row, code in enumerate(codes)}
+    except Exception:
+        _ATLAS = np.empty((0, *shape), dtype=np.uint8)
+        _ROWS = {}
+
+
+def _load_render_hash() -> str | None:
+    """
+    Load the hash of the font and settings the cached glyphs were rendered with.
+    """
+    try:
+        with open(paths.get_path(paths.GLYPH_META_FILE)) as f:
+            return json.load(f)["render_hash"]
+    except Exception:
+        return None
+
+
+def _clear_glyphs(render_hash: str) -> None:
+    """
+    Remove the atlas and the rendered glyphs, and record the hash they are rendered with from
+    now on.
+    """
+    paths.get_path(paths.GLYPH_ATLAS_FILE).unlink(missing_ok=True)
+    paths.get_path(paths.GLYPH_CODES_FILE).unlink(missing_ok=True)
+    glyphs_folder = paths.get_path(paths.GLYPHS_FOLDER)
+    if glyphs_folder.exists():
+        for path in glyphs_folder.glob(f"*.{constants.IMAGE_FORMAT}"):
+            path.unlink(missing_ok=True)
+    meta_path = paths.get_path(paths.GLYPH_META_FILE)
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    files.write_json(meta_path, {"render_hash": render_hash})
+
+
+# Save the added masks on exit
+atexit.register(flush_atlas)
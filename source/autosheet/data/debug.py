@@ -0,0 +1,128 @@
+import atexit
+import os
+import queue
+import shutil
+import threading
+from multiprocessing import util
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from autosheet.utils import constants, paths
+
+_QUEUE: queue.Queue = queue.Queue(constants.DEBUG_QUEUE_SIZE)
+_WRITER: threading.Thread | None = None
+_COUNTS: dict[Path, int] = {}
+_SAVED: int = 0
+_DROPPED: int = 0
+_FAILED: int = 0
+_LOCK: threading.Lock = threading.Lock()
+
+
+def save_debug_image(path: Path, image: np.ndarray, sampling: int = 1) -> None:
+    """
+    Queue the image to be saved in the background, keeping only every Nth image of its folder.
+    When the queue is full the image is dropped, or waits for room if dropping is disabled.
+    """
+    global _WRITER, _DROPPED
+
+    with _LOCK:
+        # Keep only every Nth image of the folder
+        count = _COUNTS.get(path.parent, 0)
+        _COUNTS[path.parent] = count + 1
+        if count % sampling != 0:
+            return
+
+        # Start the writer on the first saved image
+        if _WRITER is None:
+            _WRITER = threading.Thread(target=_write_images, daemon=True)
+            _WRITER.start()
+
+    # Copy the image so the caller can reuse its buffer
+    try:
+        _QUEUE.put((path, image.copy()), block=not constants.DEBUG_DROP)
+    except queue.Full:
+        with _LOCK:
+            _DROPPED += 1
+
+
+def flush_debug_images() -> None:
+    """
+    Wait until every queued image is saved.
+    """
+    if _WRITER is not None:
+        _QUEUE.join()
+
+
+def get_debug_stats() -> dict:
+    """
+    Get the number of debug images saved, dropped because the writer could not keep up, and
+    failed to save.
+    """
+    with _LOCK:
+        return {"saved": _SAVED, "dropped": _DROPPED, "failed": _FAILED}
+
+
+def close_debug_images() -> None:
+    """
+    Save the queued images and pack the debug folder into an archive if it is enabled.
+    """
+    flush_debug_images()
+    if constants.DEBUG and constants.DEBUG_ARCHIVE:
+        archive_debug_images()
+
+
+def archive_debug_images() -> Path:
+    """
+    Pack the debug folder into a single compressed archive next to it.
+    """
+    folder = paths.get_path(paths.DEBUG_FOLDER)
+    return Path(shutil.make_archive(str(folder), "zip", folder))
+
+
+def _write_images() -> None:
+    """
+    Save the queued images one by one, counting the saved and the failed ones.
+    """
+    global _SAVED, _FAILED
+
+    while True:
+        path, image = _QUEUE.get()
+        try:
+            saved = cv2.imwrite(str(path), image)
+        except Exception:
+            # A failed image must not stop the writer, or flushing would never return
+            saved = False
+
+        # Count the image before marking it done, so the counts are final once flushed
+        with _LOCK:
+            if saved:
+                _SAVED += 1
+            else:
+                _FAILED += 1
+        _QUEUE.task_done()
+
+
+def _reset_after_fork() -> None:
+    """
+    Give a forked process its own queue and writer. It inherits the queued images and the
+    writer of its parent but not the writer thread, so it would never save its images and
+    flushing them would never return.
+    """
+    global _QUEUE, _WRITER, _COUNTS, _SAVED, _DROPPED, _FAILED, _LOCK
+
+    _QUEUE = queue.Queue(constants.DEBUG_QUEUE_SIZE)
+    _WRITER = None
+    _COUNTS = {}
+    _SAVED = _DROPPED = _FAILED = 0
+    _LOCK = threading.Lock()
+
+    # Worker processes skip atexit, so save their queued images when they shut down
+    util.Finalize(None, flush_debug_images, exitpriority=0)
+
+
+# Save the queued images on exit, and start over in forked processes
+atexit.register(close_debug_images)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -1,46 +1,77 @@
-import json
+import atexit
 
+from autosheet.data import tables
 from autosheet.data.models.Distance import Distance
+from autosheet.data.store import Store
 from autosheet.utils import paths
 
-_DISTANCES: dict[str, list[Distance]] | None = None
+_STORE: Store | None = None
 
 
-def get_distances() -> dict:
+def get_distances() -> dict[str, list[Distance]]:
     """
     Load the precomputed distances from the cache.
     """
-    global _DISTANCES
+    distances = {}
+    for subject, target, distance in _get_store().get_pairs():
+        distances.setdefault(subject, []).append(Distance(target, distance))
+    return distances
 
-    # Return the cached distances if they are already loaded
-    if _DISTANCES is not None:
-        return _DISTANCES
 
-    # Load the distances from the cache file
-    try:
-        with open(paths.get_path(paths.DISTANCES_FILE)) as f:
-            data = json.load(f)
-        _DISTANCES = {}
+def get_distance(subject: str, target: str) -> Distance | None:
+    """
+    Load the precomputed distance from the subject to the target, if it is cached.
+    """
+    distance = _get_store().get_distance(subject, target)
+    return None if distance is None else Distance(target, distance)
 
-        # Map the loaded data to Distance objects
-        for subject, distances in data.items():
-            _DISTANCES[subject] = [Distance.from_dict(d) for d in distances]
-    except Exception:
-        _DISTANCES = {}
 
-    # Return the loaded distances
-    return _DISTANCES
+def add_distances(distances: list[tuple[str, Distance]]) -> None:
+    """
+    Add the distances of the subjects to the cache, saving them once enough have accumulated.
+    """
+    _get_store().add_pairs((subject, d.target, d.distance) for subject, d in distances)
+
+
+def flush_distances() -> None:
+    """
+    Save the distances if there are pending changes.
+    """
+    if _STORE is not None:
+        _STORE.flush()
 
 
 def save_distances() -> None:
     """
     Save the precomputed distances to the cache.
     """
-    global _DISTANCES
+    if _STORE is not None:
+        _STORE.save()
+
+
+def _get_store() -> Store:
+    """
+    Get the store of the distances, importing the JSON cache of older versions on creation.
+    """
+    global _STORE
+
+    # Open the store of the current distance table
+    if _STORE is None:
+        _STORE = Store(
+            tables.get_variant_path(paths.DISTANCES_DB),
+            tables.get_variant_path(paths.DISTANCES_FILE),
+        )
+
+        # Drop the distances computed from other fonts or rendering settings. Stores from
+        # before the settings were recorded hold the distances of the default fonts.
+        settings = tables.get_settings_hash()
+        stored_settings = _STORE.get_meta("settings")
+        if stored_settings != settings:
+            if stored_settings is not None:
+                _STORE.clear()
+            _STORE.set_meta("settings", settings)
+    return _STORE
 
-    # Serialize the distances to a dictionary
-    data = {subject: [d.to_dict() for d in distances] for subject, distances in _DISTANCES.items()}
 
-    # Save the distances to the cache file
-    with open(paths.get_path(paths.DISTANCES_FILE), "w") as f:
-        json.dump(data, f, indent=2)
+# Save the pending changes on exit
+atexit.register(flush_distances)
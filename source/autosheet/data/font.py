@@ -1,21 +1,60 @@
+import hashlib
+import json
+from pathlib import Path
+
 from PIL import ImageFont
 from PIL.ImageFont import FreeTypeFont
 
 from autosheet.utils import constants, paths
 
-_FONT: FreeTypeFont | None = None
+_FONTS: dict[str, FreeTypeFont] = {}
+_FONT_HASHES: dict[str, str] = {}
 
 
-def get_font() -> FreeTypeFont:
+def get_font(font_name: str | None = None) -> FreeTypeFont:
     """
-    Get the font for rendering glyphs.
+    Get the font for rendering glyphs. Defaults to constants.FONT_NAME, other fonts are loaded
+    from the resources folder.
     """
-    global _FONT
+    font_name = font_name or constants.FONT_NAME
 
     # Return the cached font if it exists
-    if _FONT is not None:
-        return _FONT
+    if font_name in _FONTS:
+        return _FONTS[font_name]
 
     # Load the font from the file system
-    _FONT = ImageFont.truetype(str(paths.get_path(paths.FONT_FILE)), constants.FONT_SIZE)
-    return _FONT
+    _FONTS[font_name] = ImageFont.truetype(
+        str(paths.get_path(_get_font_path(font_name))), constants.FONT_SIZE
+    )
+    return _FONTS[font_name]
+
+
+def get_render_hash(font_name: str | None = None) -> str:
+    """
+    Get a hash of the font file and of the settings glyphs are rendered with, so that caches
+    of rendered glyphs can tell when they are stale.
+    """
+    font_name = font_name or constants.FONT_NAME
+
+    # Hash the font file once
+    if font_name not in _FONT_HASHES:
+        with open(paths.get_path(_get_font_path(font_name)), "rb") as f:
+            _FONT_HASHES[font_name] = hashlib.file_digest(f, "sha256").hexdigest()
+
+    # Combine it with the rendering settings
+    settings = [
+        _FONT_HASHES[font_name],
+        constants.FONT_SIZE,
+        constants.CANVAS_SIZE,
+        constants.BLUR_RADIUS,
+    ]
+    return hashlib.sha256(json.dumps(settings).encode()).hexdigest()[:16]
+
+
+def _get_font_path(font_name: str) -> Path:
+    """
+    Get the path to the font file, relative to the resources.
+    """
+    if font_name == constants.FONT_NAME:
+        return paths.FONT_FILE
+    return paths.RESOURCES_FOLDER / font_name
@@ -1,3 +1,4 @@
+import hashlib
 import shutil
 from pathlib import Path
 
@@ -5,6 +6,8 @@ from PIL import Image
 
 from autosheet.utils import paths
 
+_IMAGE_HASHES: dict[str, Path] | None = None
+
 
 def get_last_image() -> tuple[Path, Image.Image]:
     """
@@ -21,8 +24,16 @@ def get_last_image() -> tuple[Path, Image.Image]:
 
 def copy_image(path: Path) -> tuple[str, Image.Image]:
     """
-    Copy the image to the images folder.
+    Copy the image to the images folder, unless an identical image is already there.
     """
+    image_hashes = _get_image_hashes()
+
+    # Reuse the stored copy of an identical image
+    image_hash = get_image_hash(path)
+    if image_hash in image_hashes and image_hashes[image_hash].exists():
+        existing_path = image_hashes[image_hash]
+        return existing_path.stem, Image.open(existing_path)
+
     # Generate a list of .png files in the folder
     image_paths = [file for file in paths.get_path(paths.IMAGES_FOLDER).iterdir() if file.is_file()]
 
@@ -34,6 +45,41 @@ def copy_image(path: Path) -> tuple[str, Image.Image]:
 
     # Copy the image to the images folder
     shutil.copy(path, new_path)
+    image_hashes[image_hash] = new_path
 
     # Return the copied image
     return new_path.stem, Image.open(new_path)
+
+
+def get_image_name(path: Path) -> str | None:
+    """
+    Get the name of the stored copy of the image, or None if it was not copied.
+    """
+    image_path = _get_image_hashes().get(get_image_hash(path))
+    return image_path.stem if image_path is not None and image_path.exists() else None
+
+
+def get_image_hash(path: Path) -> str:
+    """
+    Get the SHA-256 hash of the image file contents.
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _get_image_hashes() -> dict[str, Path]:
+    """
+    Get the paths of the images in the images folder by their content hash.
+    """
+    global _IMAGE_HASHES
+
+    # Return the cached hashes if they exist
+    if _IMAGE_HASHES is not None:
+        return _IMAGE_HASHES
+
+    # Hash the images in the folder
+    _IMAGE_HASHES = {}
+    for file in paths.get_path(paths.IMAGES_FOLDER).iterdir():
+        if file.is_file():
+            _IMAGE_HASHES.setdefault(get_image_hash(file), file)
+    return _IMAGE_HASHES
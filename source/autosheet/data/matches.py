@@ -1,46 +1,126 @@
+import atexit
+import hashlib
 import json
 
+from autosheet.data import pdfs, tables
 from autosheet.data.models.Match import Match
-from autosheet.utils import paths
+from autosheet.data.store import Store
+from autosheet.utils import chars, constants, paths
 
-_MATCHES: dict[str, list[Match]] | None = None
+_STORE: Store | None = None
 
 
-def get_matches() -> dict:
+def get_matches(subject: str) -> list[Match]:
     """
-    Load the precomputed mathes from the cache.
+    Load the precomputed matches of the normalized subject from the cache.
     """
-    global _MATCHES
+    return [Match(target, distance) for target, distance in _get_store().get_targets(subject)]
 
-    # Return the cached matches if they are already loaded
-    if _MATCHES is not None:
-        return _MATCHES
 
-    # Load the matches from the cache file
-    try:
-        with open(paths.get_path(paths.MATCHES_FILE)) as f:
-            data = json.load(f)
-        _MATCHES = {}
+def get_match(subject: str, target: str) -> Match | None:
+    """
+    Load the precomputed match of the subject with the target, if it is cached.
+    """
+    distance = _get_store().get_distance(subject, target)
+    return None if distance is None else Match(target, distance)
 
-        # Map the loaded data to Match objects
-        for subject, distances in data.items():
-            _MATCHES[subject] = [Match.from_dict(d) for d in distances]
-    except Exception:
-        _MATCHES = {}
 
-    # Return the loaded distances
-    return _MATCHES
+def get_all_matches() -> dict[str, list[Match]]:
+    """
+    Load every precomputed match from the cache.
+    """
+    matches = {}
+    for subject, target, distance in _get_store().get_pairs():
+        matches.setdefault(subject, []).append(Match(target, distance))
+    return matches
+
+
+def add_matches(subject: str, matches: list[Match]) -> None:
+    """
+    Add the matches of the subject to the cache, saving them once enough have accumulated.
+    """
+    _get_store().add_pairs((subject, m.target, m.distance) for m in matches)
+
+
+def sync_catalog() -> None:
+    """
+    Bring the cached matches in line with the PDF catalog. Matches with removed datasheets
+    are pruned, while added datasheets are scored for a cached subject the next time it is
+    matched, alongside its cached matches.
+    """
+    store = _get_store()
+
+    # Nothing to do if the catalog did not change
+    fingerprint = pdfs.get_pdf_fingerprint()
+    if store.get_meta("catalog") == fingerprint:
+        return
+
+    # Drop the subjects cached before keys were normalized
+    if store.get_meta("normalized") is None:
+        store.remove_subjects(s for s in store.get_subjects() if s != chars.normalize_text(s))
+        store.set_meta("normalized", "1")
+
+    # Prune the matches with removed datasheets
+    store.keep_targets(pdfs.get_pdf_names())
+    store.set_meta("catalog", fingerprint)
+
+
+def flush_matches() -> None:
+    """
+    Save the matches if there are pending changes.
+    """
+    if _STORE is not None:
+        _STORE.flush()
 
 
 def save_matches() -> None:
     """
-    Save the precomputed mathes to the cache.
+    Save the precomputed matches to the cache.
+    """
+    if _STORE is not None:
+        _STORE.save()
+
+
+def get_settings_hash() -> str:
+    """
+    Get a hash of the settings match distances depend on beyond the distance table: the
+    glyph rendering, the matching mode and the version of the matching algorithm.
+    """
+    settings = [
+        tables.get_settings_hash(),
+        constants.WINDOWED_MATCHING,
+        constants.MATCHING_VERSION,
+    ]
+    return hashlib.sha256(json.dumps(settings).encode()).hexdigest()[:16]
+
+
+def _get_store() -> Store:
+    """
+    Get the store of the matches. The JSON cache of older versions is not imported, its
+    distances come from an earlier matching algorithm.
+    """
+    global _STORE
+
+    # Open the store of the current distance table
+    if _STORE is None:
+        _STORE = Store(tables.get_variant_path(paths.MATCHES_DB))
+
+        # Drop the matches computed with other settings, or before the settings were recorded
+        settings = get_settings_hash()
+        if _STORE.get_meta("settings") != settings:
+            _STORE.clear()
+            _STORE.set_meta("settings", settings)
+        sync_catalog()
+        pdfs.add_pdf_listener(_prune_matches)
+    return _STORE
+
+
+def _prune_matches(added: list[str], removed: list[str]) -> None:
+    """
+    Prune the matches with the datasheets removed from the catalog while it is watched.
     """
-    global _MATCHES
+    sync_catalog()
 
-    # Serialize the matches to a dictionary
-    data = {subject: [d.to_dict() for d in distances] for subject, distances in _MATCHES.items()}
 
-    # Save the matches to the cache file
-    with open(paths.get_path(paths.MATCHES_FILE), "w") as f:
-        json.dump(data, f, indent=2)
+# Save the pending changes on exit
+atexit.register(flush_matches)
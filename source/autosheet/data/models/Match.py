@@ -1,14 +1,20 @@
+import sys
+
+
 class Match:
     """
-    A class representing a match between subject and target.
+    A class representing a match between subject and target. Slots keep the many instances of a
+    warm cache small, and targets are interned so repeated ones share a single string.
     """
 
+    __slots__ = ("target", "distance")
+
     def __init__(self, target: str, distance: float) -> None:
         """
         Initialize a Match object.
         """
-        self.target = target
-        self.distance = distance
+        self.target = sys.intern(target)
+        self.distance = float(distance)
 
     def to_dict(self) -> dict:
         """
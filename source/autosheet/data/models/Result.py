@@ -0,0 +1,39 @@
+class Result:
+    """
+    A class representing the analysis result of an image.
+    """
+
+    __slots__ = ("raw_text", "processed_text", "datasheet", "image", "size")
+
+    def __init__(
+        self, raw_text: str, processed_text: str, datasheet: str, image: str, size: int
+    ) -> None:
+        """
+        Initialize a Result object.
+        """
+        self.raw_text = raw_text
+        self.processed_text = processed_text
+        self.datasheet = datasheet
+        self.image = image
+        self.size = size
+
+    def to_dict(self) -> dict:
+        """
+        Convert the Result object to a dictionary.
+        """
+        return {
+            "raw_text": self.raw_text,
+            "processed_text": self.processed_text,
+            "datasheet": self.datasheet,
+            "image": self.image,
+            "size": self.size,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Result":
+        """
+        Construct a Result object from a dictionary.
+        """
+        return cls(
+            data["raw_text"], data["processed_text"], data["datasheet"], data["image"], data["size"]
+        )
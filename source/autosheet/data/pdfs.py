@@ -1,11 +1,84 @@
+import hashlib
+import threading
+from collections.abc import Callable
+
 from autosheet.utils import paths
 
 _PDF_NAMES: list[str] | None = None
+_FINGERPRINT: str | None = None
+_LISTENERS: list[Callable[[list[str], list[str]], None]] = []
+_LOCK: threading.RLock = threading.RLock()
 
 
 def get_pdf_names() -> list[str]:
     """
-    Get the names of the PDFs in the PDFs folder.
+    Get the names of the PDFs in the PDFs folder, in catalog order.
+    """
+    with _LOCK:
+        return list(_load_pdf_names())
+
+
+def get_pdf_fingerprint() -> str:
+    """
+    Get a hash of the names of the PDFs, changing whenever a PDF is added or removed.
+    """
+    global _FINGERPRINT
+
+    with _LOCK:
+        if _FINGERPRINT is None:
+            names = sorted(_load_pdf_names())
+            _FINGERPRINT = hashlib.sha256("\n".join(names).encode()).hexdigest()[:16]
+        return _FINGERPRINT
+
+
+def add_pdf_listener(listener: Callable[[list[str], list[str]], None]) -> None:
+    """
+    Call the listener with the added and the removed names whenever the catalog changes.
+    """
+    with _LOCK:
+        _LISTENERS.append(listener)
+
+
+def refresh_pdf_names() -> tuple[list[str], list[str]]:
+    """
+    List the PDFs folder again and update the catalog with the difference. Added names go to
+    the end of the catalog and removed names leave the others in place. Returns the added and
+    the removed names.
+    """
+    global _FINGERPRINT
+
+    with _LOCK:
+        # Nothing to update if the catalog was never loaded
+        if _PDF_NAMES is None:
+            _load_pdf_names()
+            return [], []
+
+        # Compare the folder with the catalog
+        names = _list_pdf_names()
+        known_names = set(_PDF_NAMES)
+        listed_names = set(names)
+        added = [name for name in names if name not in known_names]
+        removed = [name for name in _PDF_NAMES if name not in listed_names]
+        if not added and not removed:
+            return [], []
+
+        # Update the names
+        for name in removed:
+            _PDF_NAMES.remove(name)
+        for name in added:
+            _PDF_NAMES.append(name)
+        _FINGERPRINT = None
+        listeners = list(_LISTENERS)
+
+    # Let the derived indexes follow
+    for listener in listeners:
+        listener(added, removed)
+    return added, removed
+
+
+def _load_pdf_names() -> list[str]:
+    """
+    Load the names of the PDFs from the file system on first use.
     """
     global _PDF_NAMES
 
@@ -14,7 +87,12 @@ def get_pdf_names() -> list[str]:
         return _PDF_NAMES
 
     # Load the PDFs from the file system
-    _PDF_NAMES = [
-        file.stem for file in paths.get_path(paths.PDFS_FOLDER).iterdir() if file.is_file()
-    ]
+    _PDF_NAMES = _list_pdf_names()
     return _PDF_NAMES
+
+
+def _list_pdf_names() -> list[str]:
+    """
+    List the names of the files in the PDFs folder.
+    """
+    return [file.stem for file in paths.get_path(paths.PDFS_FOLDER).iterdir() if file.is_file()]
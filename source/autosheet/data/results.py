@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import json
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from autosheet.data import pdfs
+from autosheet.data.models.Result import Result
+from autosheet.utils import constants, files, paths
+
+_RESULTS: dict[str, Result] | None = None
+_CHANGES: int = 0
+_LAST_SAVE: float = time.monotonic()
+_LOCK: threading.RLock = threading.RLock()
+
+
+def get_key(image_hash: str) -> str:
+    """
+    Get the cache key of an image, combining its content hash with the configuration hash.
+    """
+    return f"{image_hash}-{get_config_hash()}"
+
+
+def get_config_hash() -> str:
+    """
+    Get a hash of every setting that affects the result of an image.
+    """
+    config = {
+        "process_profile": constants.PROCESS_PROFILE,
+        "ocr_languages": constants.OCR_LANGUAGES,
+        "alphabet": constants.ALPHABET,
+        "font_name": constants.FONT_NAME,
+        "font_names": constants.FONT_NAMES,
+        "distance_table": constants.DISTANCE_TABLE,
+        "canvas_size": constants.CANVAS_SIZE,
+        "blur_radius": constants.BLUR_RADIUS,
+        "distance_level": constants.DISTANCE_LEVEL,
+        "distance_dtype": constants.DISTANCE_DTYPE,
+        "windowed_matching": constants.WINDOWED_MATCHING,
+        "matching_version": constants.MATCHING_VERSION,
+        "pdfs": pdfs.get_pdf_fingerprint(),
+    }
+    return hashlib.sha256(json.dumps(config).encode()).hexdigest()[:16]
+
+
+def get_result(key: str) -> Result | None:
+    """
+    Get the cached result for the key, marking it as the most recently used.
+    """
+    with _LOCK:
+        results = get_results()
+        result = results.pop(key, None)
+        if result is None:
+            return None
+
+        # Move the result to the end, where the most recently used results are
+        results[key] = result
+        mark_results_dirty()
+        return result
+
+
+def add_result(
+    key: str, processed_image: np.ndarray, raw_text: str, processed_text: str, datasheet: str
+) -> Result:
+    """
+    Add a result to the cache, evicting the least recently used results if it is full.
+    """
+    # Save the processed image next to the index
+    image_path = paths.get_path(paths.RESULTS_FOLDER / f"{key}.{constants.IMAGE_FORMAT}")
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(image_path), processed_image)
+    result = Result(raw_text, processed_text, datasheet, image_path.name, image_path.stat().st_size)
+
+    with _LOCK:
+        results = get_results()
+        results.pop(key, None)
+        results[key] = result
+
+        # Evict the least recently used results until the cache fits
+        size = sum(r.size for r in results.values())
+        while size > constants.RESULTS_CACHE_BYTES and len(results) > 1:
+            evicted_key = next(iter(results))
+            evicted = results.pop(evicted_key)
+            paths.get_path(paths.RESULTS_FOLDER / evicted.image).unlink(missing_ok=True)
+            size -= evicted.size
+
+        mark_results_dirty()
+
+    # Return the added result
+    return result
+
+
+def get_results() -> dict:
+    """
+    Load the cached results, from the least to the most recently used.
+    """
+    global _RESULTS
+
+    # Return the cached results if they are already loaded
+    if _RESULTS is not None:
+        return _RESULTS
+
+    # Load the results from the cache file
+    try:
+        with open(paths.get_path(paths.RESULTS_FILE)) as f:
+            data = json.load(f)
+        _RESULTS = {}
+
+        # Map the loaded data to Result objects
+        for key, result in data.items():
+            _RESULTS[key] = Result.from_dict(result)
+    except Exception:
+        _RESULTS = {}
+
+    # Return the loaded results
+    return _RESULTS
+
+
+def mark_results_dirty(changes: int = 1) -> None:
+    """
+    Mark the results as changed and save them once enough changes have accumulated.
+    """
+    global _CHANGES
+
+    # Count the pending changes
+    _CHANGES += changes
+
+    # Save if the batch is full or the last save is too old
+    elapsed = time.monotonic() - _LAST_SAVE
+    if _CHANGES >= constants.SAVE_BATCH_SIZE or elapsed >= constants.SAVE_INTERVAL:
+        save_results()
+
+
+def flush_results() -> None:
+    """
+    Save the results if there are pending changes.
+    """
+    if _CHANGES > 0:
+        save_results()
+
+
+def save_results() -> None:
+    """
+    Save the cached results to the cache.
+    """
+    global _CHANGES, _LAST_SAVE
+
+    # Nothing to save if the results were never loaded
+    if _RESULTS is None:
+        return
+
+    # Serialize the results to a dictionary
+    with _LOCK:
+        data = {key: result.to_dict() for key, result in _RESULTS.items()}
+
+    # Save the results to the cache file
+    files.write_json(paths.get_path(paths.RESULTS_FILE), data)
+    _CHANGES = 0
+    _LAST_SAVE = time.monotonic()
+
+
+# Save the pending changes on exit
+atexit.register(flush_results)
@@ -0,0 +1,204 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from autosheet.utils import constants
+
+
+class Store:
+    """
+    A SQLite store of distances from subjects to targets. Pairs are looked up through the
+    primary key, so opening the store does not depend on its size. A store created next to a
+    JSON cache of the old format imports it once.
+    """
+
+    def __init__(self, path: Path, json_path: Path | None = None) -> None:
+        """
+        Initialize a Store object. The database is opened on first use.
+        """
+        self.path = path
+        self.json_path = json_path
+        self.connection: sqlite3.Connection | None = None
+        self.lock = threading.RLock()
+        self.changes = 0
+        self.last_save = time.monotonic()
+
+    def get_distance(self, subject: str, target: str) -> float | None:
+        """
+        Get the distance from the subject to the target, or None if it is not stored.
+        """
+        with self.lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT distance FROM pairs WHERE subject = ? AND target = ?",
+                    (subject, target),
+                )
+                .fetchone()
+            )
+        return None if row is None else row[0]
+
+    def get_targets(self, subject: str) -> list[tuple[str, float]]:
+        """
+        Get the targets stored for the subject with their distances.
+        """
+        with self.lock:
+            return (
+                self._connect()
+                .execute("SELECT target, distance FROM pairs WHERE subject = ?", (subject,))
+                .fetchall()
+            )
+
+    def get_pairs(self) -> list[tuple[str, str, float]]:
+        """
+        Get every stored subject, target and distance.
+        """
+        with self.lock:
+            return self._connect().execute("SELECT subject, target, distance FROM pairs").fetchall()
+
+    def get_subjects(self) -> list[str]:
+        """
+        Get every stored subject.
+        """
+        with self.lock:
+            rows = self._connect().execute("SELECT DISTINCT subject FROM pairs").fetchall()
+        return [subject for (subject,) in rows]
+
+    def get_meta(self, key: str) -> str | None:
+        """
+        Get a value stored about the pairs, or None if it is not stored.
+        """
+        with self.lock:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_meta(self, key: str, value: str) -> None:
+        """
+        Store a value about the pairs.
+        """
+        with self.lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value)
+            )
+            self.connection.commit()
+
+    def add_pairs(self, pairs: Iterable[tuple[str, str, float]]) -> None:
+        """
+        Store the distances from subjects to targets, replacing the stored ones. They are
+        committed once enough changes have accumulated.
+        """
+        pairs = [(subject, target, float(distance)) for subject, target, distance in pairs]
+        with self.lock:
+            self._connect().executemany(
+                "INSERT OR REPLACE INTO pairs (subject, target, distance) VALUES (?, ?, ?)", pairs
+            )
+            self.changes += len(pairs)
+
+            # Commit if the batch is full or the last commit is too old
+            elapsed = time.monotonic() - self.last_save
+            if self.changes >= constants.SAVE_BATCH_SIZE or elapsed >= constants.SAVE_INTERVAL:
+                self.save()
+
+    def remove_subjects(self, subjects: Iterable[str]) -> int:
+        """
+        Remove every pair of the subjects, returning the number of removed pairs.
+        """
+        with self.lock:
+            cursor = self._connect().executemany(
+                "DELETE FROM pairs WHERE subject = ?", ((subject,) for subject in subjects)
+            )
+            self.connection.commit()
+        return cursor.rowcount
+
+    def keep_targets(self, targets: Iterable[str]) -> int:
+        """
+        Remove every pair whose target is not one of the targets, returning the number of
+        removed pairs.
+        """
+        with self.lock:
+            connection = self._connect()
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS kept (target TEXT PRIMARY KEY)")
+            connection.execute("DELETE FROM kept")
+            connection.executemany(
+                "INSERT OR IGNORE INTO kept (target) VALUES (?)", ((t,) for t in targets)
+            )
+            cursor = connection.execute(
+                "DELETE FROM pairs WHERE target NOT IN (SELECT target FROM kept)"
+            )
+            connection.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """
+        Remove every pair.
+        """
+        with self.lock:
+            self._connect().execute("DELETE FROM pairs")
+            self.connection.commit()
+
+    def flush(self) -> None:
+        """
+        Commit the pending changes, if any.
+        """
+        if self.changes > 0:
+            self.save()
+
+    def save(self) -> None:
+        """
+        Commit the pending changes.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.commit()
+            self.changes = 0
+            self.last_save = time.monotonic()
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database, creating it and importing the old JSON cache if it is new.
+        """
+        # Return the connection if it is already open
+        if self.connection is not None:
+            return self.connection
+
+        # Open the database, shared by the threads of the process
+        is_new = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pairs ("
+            "subject TEXT NOT NULL, target TEXT NOT NULL, distance REAL NOT NULL, "
+            "PRIMARY KEY (subject, target)) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+        # Import the JSON cache once, when the database is created
+        if is_new and self.json_path is not None and self.json_path.exists():
+            self._import_json()
+        self.connection.commit()
+        return self.connection
+
+    def _import_json(self) -> None:
+        """
+        Import the pairs of a JSON cache mapping subjects to lists of targets and distances.
+        """
+        try:
+            with open(self.json_path) as f:
+                data = json.load(f)
+        except Exception:
+            return
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pairs (subject, target, distance) VALUES (?, ?, ?)",
+            (
+                (subject, pair["target"], float(pair["distance"]))
+                for subject, pairs in data.items()
+                for pair in pairs
+            ),
+        )
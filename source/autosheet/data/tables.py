@@ -0,0 +1,90 @@
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+from autosheet.data import font
+from autosheet.utils import constants, files, paths
+
+
+def get_table_path(font_name: str, level: int, dtype: str) -> Path:
+    """
+    Get the path to the compiled distance table of the font at the resolution and precision.
+    The name holds a hash of the font file, the rendering settings and the alphabet, so a table
+    compiled with other ones is never loaded.
+    """
+    size = constants.CANVAS_SIZE >> level
+    settings = f"{font.get_render_hash(font_name)}-{constants.ALPHABET}"
+    settings_hash = hashlib.sha256(settings.encode()).hexdigest()[:8]
+    return paths.get_path(
+        paths.TABLES_FOLDER / f"{Path(font_name).stem}-{size}-{dtype}-{settings_hash}.npy"
+    )
+
+
+def load_table(font_name: str, level: int, dtype: str) -> np.ndarray | None:
+    """
+    Load the compiled distance table of the font, or None if it is missing or does not cover
+    the empty glyph and the alphabet.
+    """
+    try:
+        table = np.load(get_table_path(font_name, level, dtype))
+    except Exception:
+        return None
+
+    # A table of another size is damaged and must be rebuilt
+    size = len(constants.ALPHABET) + 1
+    if table.shape != (size, size):
+        return None
+    return table
+
+
+def save_table(font_name: str, table: np.ndarray, level: int, dtype: str) -> None:
+    """
+    Save the compiled distance table of the font.
+    """
+    path = get_table_path(font_name, level, dtype)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    files.write_npy(path, table)
+
+
+def get_table_fonts() -> list[str]:
+    """
+    Get the fonts the selected distance table is computed from.
+    """
+    if constants.DISTANCE_TABLE in constants.DISTANCE_AGGREGATES:
+        return list(constants.FONT_NAMES)
+    return [constants.DISTANCE_TABLE]
+
+
+def get_settings_hash() -> str:
+    """
+    Get a hash of the fonts and rendering settings glyph distances depend on. The table,
+    resolution and precision are not part of it, they name the variant path instead.
+    """
+    render_hashes = [font.get_render_hash(font_name) for font_name in get_table_fonts()]
+    return hashlib.sha256(",".join(render_hashes).encode()).hexdigest()[:16]
+
+
+def get_variant_path(relative_path: Path) -> Path:
+    """
+    Get the absolute path to a cache file depending on glyph distances. Distances from another
+    table, resolution or precision than the default are cached apart from the default ones.
+    """
+    variant = []
+
+    # Name the table, aggregates by the fonts they cover
+    if constants.DISTANCE_TABLE in constants.DISTANCE_AGGREGATES:
+        fonts_hash = hashlib.sha256(",".join(constants.FONT_NAMES).encode()).hexdigest()[:8]
+        variant.append(f"{constants.DISTANCE_TABLE}-{fonts_hash}")
+    elif constants.DISTANCE_TABLE != constants.FONT_NAME:
+        variant.append(Path(constants.DISTANCE_TABLE).stem)
+
+    # Name the resolution and the precision
+    if constants.DISTANCE_LEVEL != 0 or constants.DISTANCE_DTYPE != "float64":
+        size = constants.CANVAS_SIZE >> constants.DISTANCE_LEVEL
+        variant.append(f"{size}-{constants.DISTANCE_DTYPE}")
+
+    # Return the default path if nothing differs
+    if not variant:
+        return paths.get_path(relative_path)
+    return paths.get_path(relative_path.with_stem(f"{relative_path.stem}-{'-'.join(variant)}"))
@@ -0,0 +1,130 @@
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+from autosheet.data import pdfs
+from autosheet.utils import constants, paths
+
+# inotify events of files entering or leaving a folder, and of the folder going away
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_DELETE_SELF: int = 0x00000400
+IN_MOVE_SELF: int = 0x00000800
+IN_CLOEXEC: int = 0o2000000
+EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+
+_WATCHER: threading.Thread | None = None
+_LOCK: threading.Lock = threading.Lock()
+
+
+def watch_pdfs(
+    on_change: Callable[[list[str], list[str], OSError | None], None] | None = None,
+) -> None:
+    """
+    Start watching the PDFs folder in the background, so datasheets added to or removed from
+    it update the catalog without a restart. Uses inotify on Linux and polls elsewhere. Calls
+    on_change with the added and the removed names, or with the error if the refresh failed.
+    """
+    global _WATCHER
+
+    with _LOCK:
+        # Watch the folder only once
+        if _WATCHER is not None:
+            return
+
+        # Prefer inotify and fall back to polling if it is not available
+        fd = _init_inotify()
+        target = _poll_pdfs if fd is None else _read_events
+        args = (on_change,) if fd is None else (fd, on_change)
+        _WATCHER = threading.Thread(target=target, args=args, daemon=True)
+        _WATCHER.start()
+
+
+def _init_inotify() -> int | None:
+    """
+    Watch the PDFs folder with inotify, returning the file descriptor to read the events from.
+    Returns None if inotify is not available.
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+        folder = os.fsencode(paths.get_path(paths.PDFS_FOLDER))
+        if libc.inotify_add_watch(fd, folder, mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (AttributeError, OSError):
+        return None
+
+
+def _read_events(
+    fd: int, on_change: Callable[[list[str], list[str], OSError | None], None] | None
+) -> None:
+    """
+    Refresh the catalog whenever inotify reports a change in the PDFs folder.
+    """
+    while True:
+        data = os.read(fd, 64 * 1024)
+
+        # Stop watching if the folder itself goes away, polling picks it up if it comes back
+        offset = 0
+        folder_gone = False
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            folder_gone |= bool(mask & (IN_DELETE_SELF | IN_MOVE_SELF))
+            offset += EVENT_HEADER.size + length
+
+        # Let a burst of events settle before listing the folder once
+        time.sleep(constants.CATALOG_SETTLE_TIME)
+        _refresh_pdfs(on_change)
+        if folder_gone:
+            os.close(fd)
+            _poll_pdfs(on_change)
+            return
+
+
+def _poll_pdfs(
+    on_change: Callable[[list[str], list[str], OSError | None], None] | None,
+) -> None:
+    """
+    Refresh the catalog whenever the modification time of the PDFs folder changes.
+    """
+    last_modified = None
+    while True:
+        try:
+            modified = paths.get_path(paths.PDFS_FOLDER).stat().st_mtime_ns
+        except OSError:
+            modified = None
+        if modified != last_modified:
+            if last_modified is not None:
+                _refresh_pdfs(on_change)
+            last_modified = modified
+        time.sleep(constants.CATALOG_POLL_INTERVAL)
+
+
+def _refresh_pdfs(
+    on_change: Callable[[list[str], list[str], OSError | None], None] | None,
+) -> None:
+    """
+    Refresh the catalog, passing the changes or the error to on_change.
+    """
+    try:
+        added, removed = pdfs.refresh_pdf_names()
+    except OSError as e:
+        if on_change is not None:
+            on_change([], [], e)
+        return
+    if (added or removed) and on_change is not None:
+        on_change(added, removed, None)
@@ -1,24 +1,194 @@
-import sys
+import argparse
+import atexit
+from pathlib import Path
 
-import wx
-
-from autosheet.app.Window import Window
-from autosheet.utils import constants, strings
+from autosheet.utils import constants, profiling, strings
 
 
 def main():
     """
     Main function to run the application
     """
-    if "--debug" in sys.argv:
+    parser = argparse.ArgumentParser(prog="autosheet", description=strings.CLI_DESCRIPTION)
+    parser.add_argument("--debug", action="store_true", help=strings.CLI_DEBUG_HELP)
+    parser.add_argument(
+        "--debug-sampling",
+        type=int,
+        default=constants.DEBUG_SAMPLING,
+        help=strings.CLI_DEBUG_SAMPLING_HELP,
+    )
+    parser.add_argument("--debug-archive", action="store_true", help=strings.CLI_DEBUG_ARCHIVE_HELP)
+    parser.add_argument(
+        "--profile",
+        choices=constants.PROCESS_PROFILES,
+        default=constants.PROCESS_PROFILE,
+        help=strings.CLI_PROFILE_HELP,
+    )
+    parser.add_argument(
+        "--fonts", nargs="+", default=constants.FONT_NAMES, help=strings.CLI_FONTS_HELP
+    )
+    parser.add_argument(
+        "--distance-table", default=constants.DISTANCE_TABLE, help=strings.CLI_DISTANCE_TABLE_HELP
+    )
+    parser.add_argument("--trace", type=Path, help=strings.CLI_TRACE_HELP)
+    parser.add_argument(
+        "--trace-format",
+        choices=("chrome", "json"),
+        default="chrome",
+        help=strings.CLI_TRACE_FORMAT_HELP,
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    # Batch command
+    batch_parser = commands.add_parser("batch", help=strings.CLI_BATCH_HELP)
+    batch_parser.add_argument("folder", type=Path, help=strings.CLI_BATCH_FOLDER_HELP)
+    batch_parser.add_argument(
+        "--output", type=Path, default=Path("results.jsonl"), help=strings.CLI_BATCH_OUTPUT_HELP
+    )
+    batch_parser.add_argument(
+        "--workers", type=int, default=constants.BATCH_WORKERS, help=strings.CLI_BATCH_WORKERS_HELP
+    )
+
+    # Serve command
+    serve_parser = commands.add_parser("serve", help=strings.CLI_SERVE_HELP)
+    serve_parser.add_argument(
+        "--host", default=constants.SERVE_HOST, help=strings.CLI_SERVE_HOST_HELP
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=constants.SERVE_PORT, help=strings.CLI_SERVE_PORT_HELP
+    )
+
+    # Match command
+    match_parser = commands.add_parser("match", help=strings.CLI_MATCH_HELP)
+    match_parser.add_argument("images", type=Path, nargs="+", help=strings.CLI_MATCH_IMAGES_HELP)
+    match_parser.add_argument(
+        "--server",
+        default=f"http://{constants.SERVE_HOST}:{constants.SERVE_PORT}",
+        help=strings.CLI_MATCH_SERVER_HELP,
+    )
+    match_parser.add_argument(
+        "--limit", type=int, default=constants.MATCH_RANKS, help=strings.CLI_MATCH_LIMIT_HELP
+    )
+
+    args = parser.parse_args()
+    if args.debug:
         constants.DEBUG = True
+    constants.DEBUG_SAMPLING = max(1, args.debug_sampling)
+    constants.DEBUG_ARCHIVE = args.debug_archive
+    constants.PROCESS_PROFILE = args.profile
+    constants.FONT_NAMES = args.fonts
+    if args.distance_table not in constants.DISTANCE_AGGREGATES + tuple(args.fonts):
+        parser.error(strings.CLI_DISTANCE_TABLE_ERROR.format(args.distance_table))
+    constants.DISTANCE_TABLE = args.distance_table
+
+    # Report the debug images that could not be saved on exit
+    if args.debug:
+        atexit.register(report_debug_images)
+
+    # Record where the time goes and save it on exit
+    if args.trace is not None:
+        profiling.enable()
+        if args.trace_format == "json":
+            atexit.register(profiling.save_records, args.trace)
+        else:
+            atexit.register(profiling.save_chrome_trace, args.trace)
+
+    # Run the requested command
+    if args.command == "batch":
+        run_batch(args)
+    elif args.command == "serve":
+        run_serve(args)
+    elif args.command == "match":
+        run_match(args)
+    else:
+        run_gui()
+
+
+def report_debug_images() -> None:
+    """
+    Report the debug images that were dropped or failed to save.
+    """
+    from autosheet.data import debug
+
+    debug.flush_debug_images()
+    stats = debug.get_debug_stats()
+    if stats["dropped"] > 0 or stats["failed"] > 0:
+        print(strings.DEBUG_IMAGES_REPORT.format(**stats))
+
+
+def report_pdf_changes(added: list[str], removed: list[str], error: OSError | None) -> None:
+    """
+    Report the datasheets added to or removed from the watched PDFs folder.
+    """
+    if error is not None:
+        print(strings.PDFS_REFRESH_ERROR.format(error))
+    else:
+        print(strings.PDFS_UPDATED_REPORT.format(added=len(added), removed=len(removed)))
+
+
+def run_gui() -> None:
+    """
+    Run the graphical application.
+    """
+    # Only the GUI needs wx, so headless commands do not import it
+    import wx
+
+    from autosheet.app import warmup
+    from autosheet.app.Window import Window
+    from autosheet.data import watcher
 
     app = wx.App(redirect=False, useBestVisual=True)
     window = Window(strings.APP_NAME, constants.WINDOW_SIZE)
     window.Center()
     window.Show()
+
+    # Load the heavy modules and the OCR models once the window is up and show when they are
+    wx.CallAfter(warmup.start_warm_up, lambda error: wx.CallAfter(window.show_ready, error))
+
+    # Pick up datasheets added while the application runs
+    watcher.watch_pdfs(report_pdf_changes)
     app.MainLoop()
 
 
+def run_batch(args: argparse.Namespace) -> None:
+    """
+    Run the batch command without a GUI.
+    """
+    from autosheet.app import batch, warmup
+    from autosheet.data import watcher
+
+    # Load the OCR models while the first images are loaded and processed
+    warmup.start_warm_up()
+    watcher.watch_pdfs(report_pdf_changes)
+    batch.run_batch(args.folder, args.output, args.workers)
+
+
+def run_serve(args: argparse.Namespace) -> None:
+    """
+    Run the server command, keeping the models loaded for its clients.
+    """
+    from autosheet.app import server
+    from autosheet.data import watcher
+
+    watcher.watch_pdfs(report_pdf_changes)
+    server.run_server(args.host, args.port)
+
+
+def run_match(args: argparse.Namespace) -> None:
+    """
+    Run the match command, leaving the work to a running server.
+    """
+    from autosheet.app import client
+
+    results = client.request_matches(args.images, args.server.rstrip("/"), max(1, args.limit))
+    for image_path, result in zip(args.images, results):
+        if "error" in result:
+            print(strings.IMAGE_RESULT_REPORT.format(image_path, result["error"]))
+            continue
+        print(strings.IMAGE_RESULT_REPORT.format(image_path, result["datasheet"]))
+        for pdf_match in result["matches"]:
+            print(strings.MATCH_RANK_REPORT.format(**pdf_match))
+
+
 if __name__ == "__main__":
     main()
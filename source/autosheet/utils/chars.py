@@ -1,3 +1,11 @@
+def normalize_text(text: str) -> str:
+    """
+    Normalize recognized text for matching by dropping whitespace and ignoring case, as the
+    datasheet names and the glyph alphabet are uppercase.
+    """
+    return "".join(text.split()).upper()
+
+
 def get_safe_name(char: str) -> str:
     """
     Get a safe name and code for a given character.
@@ -5,3 +5,38 @@ FONT_NAME: str = "font.ttf"
 CANVAS_SIZE: int = 256
 FONT_SIZE: int = CANVAS_SIZE * 0.8
 BLUR_RADIUS: int = CANVAS_SIZE / 20
+ALPHABET: str = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+SAVE_BATCH_SIZE: int = 512
+SAVE_INTERVAL: float = 10.0
+DISTANCE_CHUNK_BYTES: int = 64 * 1024 * 1024
+WINDOWED_MATCHING: bool = False
+MATCHING_VERSION: int = 2
+NGRAM_SIZE: int = 2
+MATCH_CANDIDATES: int = 64
+MATCH_RANKS: int = 5
+OCR_LANGUAGES: list[str] = ["en"]
+OCR_READERS: int = 1
+OCR_BATCH_SIZE: int = 8
+IMAGE_SUFFIXES: tuple[str, ...] = (".png", ".jpg", ".jpeg", ".bmp")
+BATCH_WORKERS: int = 4
+PIPELINE_CAPACITY: int = 4
+RESULTS_CACHE_BYTES: int = 256 * 1024 * 1024
+PROCESS_PROFILES: tuple[str, ...] = ("accurate", "fast", "realtime")
+PROCESS_PROFILE: str = "accurate"
+PROFILE: bool = False
+DISTANCE_LEVEL: int = 0
+DISTANCE_DTYPES: tuple[str, ...] = ("float64", "float32", "uint8")
+DISTANCE_DTYPE: str = "float64"
+FONT_NAMES: list[str] = [FONT_NAME]
+DISTANCE_AGGREGATES: tuple[str, ...] = ("min", "mean")
+DISTANCE_TABLE: str = FONT_NAME
+DEBUG_QUEUE_SIZE: int = 256
+DEBUG_DROP: bool = True
+DEBUG_SAMPLING: int = 1
+DEBUG_ARCHIVE: bool = False
+CATALOG_POLL_INTERVAL: float = 2.0
+CATALOG_SETTLE_TIME: float = 0.2
+SERVE_HOST: str = "127.0.0.1"
+SERVE_PORT: int = 8765
+SERVE_BATCH_WAIT: float = 0.02
+SERVE_MAX_UPLOAD_BYTES: int = 32 * 1024 * 1024
@@ -0,0 +1,34 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+def write_json(path: Path, data: dict) -> None:
+    """
+    Atomically write the data as JSON by writing a temporary file and renaming it.
+    """
+    # Write next to the destination so the rename stays on the same file system
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "w") as f:
+            f.write(json.dumps(data))
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_npy(path: Path, array: np.ndarray) -> None:
+    """
+    Atomically write the array in the NumPy format by writing a temporary file and renaming it.
+    """
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
@@ -13,8 +13,16 @@ PDFS_FOLDER: Path = DATA_FOLDER / "pdfs"
 
 CACHE_FOLDER: Path = DATA_FOLDER / "cache"
 GLYPHS_FOLDER: Path = CACHE_FOLDER / "glyphs"
+GLYPH_ATLAS_FILE: Path = CACHE_FOLDER / "glyphs.npy"
+GLYPH_CODES_FILE: Path = CACHE_FOLDER / "glyph-codes.npy"
+GLYPH_META_FILE: Path = CACHE_FOLDER / "glyphs.json"
 DISTANCES_FILE: Path = CACHE_FOLDER / "distances.json"
 MATCHES_FILE: Path = CACHE_FOLDER / "matches.json"
+DISTANCES_DB: Path = CACHE_FOLDER / "distances.sqlite"
+MATCHES_DB: Path = CACHE_FOLDER / "matches.sqlite"
+RESULTS_FOLDER: Path = CACHE_FOLDER / "results"
+RESULTS_FILE: Path = CACHE_FOLDER / "results.json"
+TABLES_FOLDER: Path = CACHE_FOLDER / "tables"
 
 DEBUG_FOLDER: Path = CACHE_FOLDER / "debug"
 DEBUG_DISTANCED_FOLDER: Path = DEBUG_FOLDER / "distanced"
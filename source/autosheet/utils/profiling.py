@@ -0,0 +1,174 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import nullcontext
+from pathlib import Path
+
+from autosheet.utils import constants
+
+_RECORDS: list[dict] = []
+_RECORDS_LOCK: threading.Lock = threading.Lock()
+_OPEN_SPANS: set["_Span"] = set()
+_SPANS_LOCK: threading.Lock = threading.Lock()
+_DISABLED = nullcontext()
+
+
+class _Span:
+    """
+    A context manager recording the wall time, CPU time and peak traced memory of a block.
+    tracemalloc only keeps one peak for the whole process, so the peak of a block includes
+    what other threads allocated meanwhile. It is an upper bound rather than exact per thread.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize a _Span object.
+        """
+        self.name = name
+        self.memory = 0
+        self.peak = 0
+
+    def __enter__(self) -> "_Span":
+        """
+        Start measuring the block.
+        """
+        # Memory is measured from the traced memory in use when the block starts
+        if tracemalloc.is_tracing():
+            with _SPANS_LOCK:
+                # Resetting the peak would erase it for the blocks still open, nested ones or on
+                # other threads, so they keep the peak reached so far first
+                self.memory, peak = tracemalloc.get_traced_memory()
+                for span in _OPEN_SPANS:
+                    span.peak = max(span.peak, peak)
+                tracemalloc.reset_peak()
+                _OPEN_SPANS.add(self)
+
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, *_) -> None:
+        """
+        Stop measuring the block and record it.
+        """
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.cpu_start
+
+        # Get the peak of this block, including the peaks of the nested blocks
+        peak_memory = 0
+        if tracemalloc.is_tracing():
+            with _SPANS_LOCK:
+                _OPEN_SPANS.discard(self)
+                _, peak = tracemalloc.get_traced_memory()
+                self.peak = max(self.peak, peak)
+            peak_memory = self.peak - self.memory
+
+        add_records(
+            [
+                {
+                    "name": self.name,
+                    "start": self.start,
+                    "wall": wall,
+                    "cpu": cpu,
+                    "peak_memory": peak_memory,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                }
+            ]
+        )
+
+
+def enable(trace_memory: bool = True) -> None:
+    """
+    Enable profiling, optionally tracing memory allocations to report peak memory.
+    """
+    constants.PROFILE = True
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def profile(name: str):
+    """
+    Get a context manager recording the block under the given name. Does nothing when
+    profiling is disabled.
+    """
+    if not constants.PROFILE:
+        return _DISABLED
+    return _Span(name)
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorate a function so each call is recorded under the given name. Calls go straight to
+    the function when profiling is disabled.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not constants.PROFILE:
+                return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def add_records(records: list[dict]) -> None:
+    """
+    Add records, for example ones collected by a worker process.
+    """
+    with _RECORDS_LOCK:
+        _RECORDS.extend(records)
+
+
+def pop_records() -> list[dict]:
+    """
+    Get and remove the collected records.
+    """
+    with _RECORDS_LOCK:
+        records = list(_RECORDS)
+        _RECORDS.clear()
+    return records
+
+
+def get_records() -> list[dict]:
+    """
+    Get the collected records.
+    """
+    with _RECORDS_LOCK:
+        return list(_RECORDS)
+
+
+def save_records(path: Path) -> None:
+    """
+    Save the collected records as a JSON list.
+    """
+    with open(path, "w") as f:
+        json.dump(get_records(), f, indent=2)
+
+
+def save_chrome_trace(path: Path) -> None:
+    """
+    Save the collected records in the Chrome trace format, viewable in chrome://tracing.
+    """
+    events = [
+        {
+            "name": record["name"],
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["wall"] * 1e6,
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": {"cpu_ms": record["cpu"] * 1e3, "peak_memory": record["peak_memory"]},
+        }
+        for record in get_records()
+    ]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events}, f)
@@ -1,7 +1,7 @@
 from importlib.metadata import version
 
 APP_NAME: str = "AutoSheet"
-VERSION_LABEL: str = f"Version {version("autosheet")}"
+VERSION_LABEL: str = f"Version {version('autosheet')}"
 DESCRIPTION_LABEL: str = "Datasheet finder"
 
 STEPS_LABEL_1_LOADING: str = "(1/4) Loading the image..."
@@ -10,6 +10,10 @@ STEPS_LABEL_3_RECOGNIZING: str = "(3/4) Recognizing the text..."
 STEPS_LABEL_4_FINDING: str = "(4/4) Finding the datasheet..."
 STEPS_LABEL_5_DONE: str = "Done!"
 
+STATUS_LABEL_WARMING_UP: str = "Preparing the models..."
+STATUS_LABEL_READY: str = "Ready"
+STATUS_LABEL_FAILED: str = "Models failed to load: "
+
 RESULT_LABEL_INITIAL: str = "Select an image to start"
 RESULT_LAVEL_ANALYZING: str = "Analyzing image..."
 RESULT_LABEL_DONE: str = "Component: "
@@ -21,3 +25,41 @@ OPEN_DATASHEET_BTN_LABEL: str = "Open Datasheet"
 FILE_DIALOG_TITLE: str = "Select an image"
 
 ERROR_DIALOG_TITLE: str = "Error"
+
+DEBUG_IMAGES_REPORT: str = "Debug images: {saved} saved, {dropped} dropped, {failed} failed"
+PDFS_UPDATED_REPORT: str = "Datasheets updated: {added} added, {removed} removed"
+PDFS_REFRESH_ERROR: str = "Failed to refresh the datasheets: {}"
+IMAGE_RESULT_REPORT: str = "{}: {}"
+MATCH_RANK_REPORT: str = "  {distance:.2f} {datasheet}"
+BATCH_STAGE_REPORT: str = (
+    "{stage}: {count} images, {throughput:.2f} images/s, {utilization:.0%} busy, "
+    "max queue depth {max_queue_depth}"
+)
+SERVE_LISTENING_REPORT: str = "Serving on http://{}:{}"
+
+SERVE_ERROR_NOT_FOUND: str = "Not found"
+SERVE_ERROR_NO_IMAGE: str = "The request has no image"
+SERVE_ERROR_INCOMPLETE: str = "The image is incomplete"
+SERVE_ERROR_TOO_LARGE: str = "The image is over {} bytes"
+
+CLI_DESCRIPTION: str = "Find datasheets for electronic components."
+CLI_DEBUG_HELP: str = "save intermediate images to the debug folder"
+CLI_DEBUG_SAMPLING_HELP: str = "save only every Nth glyph distance image in debug mode"
+CLI_DEBUG_ARCHIVE_HELP: str = "also pack the debug images into a zip archive on exit"
+CLI_PROFILE_HELP: str = "preprocessing profile, trading accuracy for speed"
+CLI_FONTS_HELP: str = "fonts in the resources folder to compile glyph distance tables for"
+CLI_DISTANCE_TABLE_HELP: str = "glyph distance table: one of the fonts, or min or mean across fonts"
+CLI_DISTANCE_TABLE_ERROR: str = "distance table {} is neither a given font nor min or mean"
+CLI_TRACE_HELP: str = "record the time and memory of each step and save them to this file on exit"
+CLI_TRACE_FORMAT_HELP: str = "format of the trace file, chrome for chrome://tracing or json"
+CLI_BATCH_HELP: str = "find the datasheets for every image in a folder"
+CLI_BATCH_FOLDER_HELP: str = "folder containing the component images"
+CLI_BATCH_OUTPUT_HELP: str = "results file, written as CSV if it ends in .csv and JSONL otherwise"
+CLI_BATCH_WORKERS_HELP: str = "number of processes used to preprocess the images"
+CLI_SERVE_HELP: str = "serve datasheet matches over HTTP, keeping the models loaded"
+CLI_SERVE_HOST_HELP: str = "address to listen on, 0.0.0.0 to accept other machines"
+CLI_SERVE_PORT_HELP: str = "port to listen on"
+CLI_MATCH_HELP: str = "find the datasheets for images through a running server"
+CLI_MATCH_IMAGES_HELP: str = "component images to send to the server"
+CLI_MATCH_SERVER_HELP: str = "URL of the server"
+CLI_MATCH_LIMIT_HELP: str = "number of ranked datasheets to show for each image"
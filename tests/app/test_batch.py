@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from autosheet.app import batch, operations
+from autosheet.data import image, results
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    # Keep the cache and the copied images of every test in the temporary folder
+    monkeypatch.setattr(paths, "RESULTS_FOLDER", tmp_path / "results")
+    monkeypatch.setattr(paths, "RESULTS_FILE", tmp_path / "results.json")
+    monkeypatch.setattr(paths, "IMAGES_FOLDER", tmp_path / "images")
+    monkeypatch.setattr(results, "_RESULTS", None)
+    monkeypatch.setattr(image, "_IMAGE_HASHES", None)
+    paths.IMAGES_FOLDER.mkdir()
+    Image.new("RGB", (8, 8)).save(paths.IMAGES_FOLDER / "1.png")
+    return tmp_path
+
+
+def test_load_image_cached(cache_folder) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    image_path = cache_folder / "chip.png"
+    pixels = np.random.default_rng(0).integers(0, 256, (32, 64, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(image_path)
+    job = batch._load_image({"image": str(image_path)})
+    pdf_path = paths.get_path(paths.PDFS_FOLDER / "74LS00.pdf")
+    operations.cache_datasheet(job["key"], np.zeros((8, 8), np.uint8), "74LS0O", "74LS00", pdf_path)
+
+    # Check an image that was already analyzed gets its cached details without being loaded
+    cached_job = batch._load_image({"image": str(image_path)})
+    assert "raw_image" not in cached_job
+    assert cached_job["name"] == job["name"] == "2"
+    assert (cached_job["raw_text"], cached_job["processed_text"]) == ("74LS0O", "74LS00")
+    assert (cached_job["datasheet"], cached_job["path"]) == ("74LS00", str(pdf_path))
@@ -0,0 +1,170 @@
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from autosheet.app.pipeline import Pipeline, Stage
+from autosheet.data import debug
+from autosheet.utils import constants
+
+
+class Fatal(BaseException):
+    pass
+
+
+def double(item: int) -> int:
+    return item * 2
+
+
+def increment(item: int) -> int:
+    return item + 1
+
+
+def fail_on_three(item: int) -> int:
+    if item == 3:
+        raise ValueError("three")
+    return item
+
+
+def save_debug(path: str) -> str:
+    debug.save_debug_image(Path(path), np.zeros((8, 8), dtype=np.uint8))
+    return path
+
+
+def test_pipeline_run() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    pipeline = Pipeline(
+        [Stage("fail", fail_on_three), Stage("double", double), Stage("increment", increment)]
+    )
+    results = list(pipeline.run(range(6)))
+
+    # Check single worker stages keep the order and failed items skip the remaining stages
+    assert [item for item, _ in results] == [1, 3, 5, 3, 9, 11]
+    assert [str(error) if error else None for _, error in results] == [
+        None,
+        None,
+        None,
+        "three",
+        None,
+        None,
+    ]
+
+
+def test_pipeline_workers() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    pipeline = Pipeline(
+        [Stage("double", double, 3), Stage("increment", increment, 2, processes=True)]
+    )
+    results = list(pipeline.run(range(20)))
+
+    # Check every item goes through every stage once
+    assert sorted(item for item, _ in results) == [2 * i + 1 for i in range(20)]
+    assert all(error is None for _, error in results)
+
+
+def test_pipeline_backpressure() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    pulled = []
+
+    def items():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    def slow(item: int) -> int:
+        time.sleep(0.005)
+        return item
+
+    pipeline = Pipeline([Stage("fast", increment), Stage("slow", slow)], capacity=1)
+    first_pulled = None
+    for _ in pipeline.run(items()):
+        if first_pulled is None:
+            first_pulled = len(pulled)
+
+    # Check the slow stage holds back the input and the queues stay bounded
+    assert first_pulled < 10
+    assert all(stats["max_queue_depth"] <= 1 for stats in pipeline.get_stats())
+
+
+def test_pipeline_stats() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    pipeline = Pipeline([Stage("fail", fail_on_three), Stage("double", double, 2)])
+    list(pipeline.run(range(5)))
+    stats = pipeline.get_stats()
+
+    # Check failed items are not counted by the stages they skip
+    assert [s["stage"] for s in stats] == ["fail", "double"]
+    assert [s["count"] for s in stats] == [5, 4]
+    assert [s["workers"] for s in stats] == [1, 2]
+    assert all(s["throughput"] > 0 and 0 <= s["utilization"] <= 1 for s in stats)
+    assert all(s["queue_depth"] == 0 for s in stats)
+
+
+def test_pipeline_feeder_error() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    def items():
+        yield 1
+        yield 2
+        raise OSError("unreadable")
+
+    pipeline = Pipeline([Stage("double", double)])
+    results = []
+
+    # Check the items read before the error come out and the error reaches the caller
+    with pytest.raises(OSError, match="unreadable"):
+        for item, _ in pipeline.run(items()):
+            results.append(item)
+    assert results == [2, 4]
+
+
+def test_pipeline_worker_error() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    def fatal(item: int) -> int:
+        if item == 2:
+            raise Fatal()
+        return item
+
+    pipeline = Pipeline([Stage("fatal", fatal, 2), Stage("double", double)])
+
+    # Check a worker dying does not leave the run waiting
+    with pytest.raises(Fatal):
+        list(pipeline.run(range(4)))
+
+
+def test_pipeline_debug_images(tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing with the writer of this process started before the workers fork
+    debug.save_debug_image(tmp_path / "parent.png", np.zeros((8, 8), dtype=np.uint8))
+    paths = [str(tmp_path / f"{i}.png") for i in range(4)]
+    pipeline = Pipeline([Stage("save", save_debug, 2, processes=True)])
+    results = []
+    run = threading.Thread(target=lambda: results.extend(pipeline.run(paths)), daemon=True)
+    run.start()
+    run.join(60)
+
+    # Check the run ends and the workers save their own images
+    assert not run.is_alive()
+    assert sorted(item for item, _ in results) == paths
+    assert all(Path(path).exists() for path in paths)
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from autosheet.app import client, server, warmup
+from autosheet.core import recognition
+from autosheet.data import image, matches, results
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture
+def url(tmp_path, monkeypatch):
+    # Keep the caches of every test in the temporary folder and recognize a fixed text
+    monkeypatch.setattr(paths, "RESULTS_FOLDER", tmp_path / "results")
+    monkeypatch.setattr(paths, "RESULTS_FILE", tmp_path / "results.json")
+    monkeypatch.setattr(paths, "IMAGES_FOLDER", tmp_path / "images")
+    monkeypatch.setattr(paths, "MATCHES_DB", tmp_path / "matches.sqlite")
+    (tmp_path / "images").mkdir()
+    Image.new("RGB", (8, 8)).save(tmp_path / "images" / "1.png")
+    monkeypatch.setattr(results, "_RESULTS", None)
+    monkeypatch.setattr(image, "_IMAGE_HASHES", None)
+    monkeypatch.setattr(matches, "_STORE", None)
+    monkeypatch.setattr(recognition, "get_recognitions", lambda images: ["74LS00"] * len(images))
+
+    # Serve on a free port for the length of the test
+    http_server = server.Server(("127.0.0.1", 0))
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{http_server.server_port}"
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def test_batcher(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    calls = []
+
+    def get_recognitions(images: list) -> list[str]:
+        calls.append(len(images))
+        return [f"text {i}" for i in images]
+
+    monkeypatch.setattr(recognition, "get_recognitions", get_recognitions)
+    batcher = server.Batcher(batch_size=8, wait=0.5, workers=1)
+    requests = [[0], [1, 2], [3]]
+    with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+        texts = list(executor.map(batcher.recognize, requests))
+
+    # Check the requests share one call and each gets its own texts back in order
+    assert calls == [4]
+    assert texts == [["text 0"], ["text 1", "text 2"], ["text 3"]]
+
+
+def test_batcher_error(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    def get_recognitions(images: list) -> list[str]:
+        raise RuntimeError("no model")
+
+    monkeypatch.setattr(recognition, "get_recognitions", get_recognitions)
+    batcher = server.Batcher(batch_size=8, wait=0.5, workers=1)
+
+    def recognize(images: list) -> str:
+        try:
+            batcher.recognize(images)
+        except RuntimeError as e:
+            return str(e)
+        return ""
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        errors = list(executor.map(recognize, [[0], [1, 2]]))
+
+    # Check the error reaches every request of the batch
+    assert errors == ["no model", "no model"]
+
+
+def test_status(url, monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    ready = threading.Event()
+    monkeypatch.setattr(warmup, "_READY", ready)
+
+    # Check the status follows the warm-up
+    assert client.get_status(url) == {"ready": False, "error": None}
+    ready.set()
+    assert client.get_status(url) == {"ready": True, "error": None}
+
+    # Check unknown paths are not found
+    with pytest.raises(RuntimeError, match="Not found"):
+        client._request(f"{url}/unknown")
+
+
+def test_match(url, tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    image_path = tmp_path / "chip.png"
+    pixels = np.random.default_rng(0).integers(0, 256, (32, 64, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(image_path)
+    result = client.request_match(image_path, url, limit=2)
+
+    # Check the image is matched to its ranked datasheets
+    assert result["raw_text"] == result["processed_text"] == "74LS00"
+    assert result["datasheet"] == "74LS00"
+    assert len(result["matches"]) == 2
+    assert result["matches"][0] == {
+        "datasheet": "74LS00",
+        "path": result["path"],
+        "distance": 0.0,
+    }
+    assert not result["cached"]
+
+    # Check the same image is answered from the result cache with the same details
+    cached_result = client.request_match(image_path, url, limit=2)
+    assert cached_result["cached"]
+    assert cached_result["image"] == result["image"]
+    assert cached_result["raw_text"] == result["raw_text"]
+
+
+def test_match_errors(url, tmp_path, monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    image_path = tmp_path / "chip.png"
+    image_path.write_bytes(b"")
+
+    # Check an empty upload is rejected
+    with pytest.raises(RuntimeError, match="no image"):
+        client.request_match(image_path, url)
+
+    # Check an upload over the limit is rejected
+    monkeypatch.setattr(constants, "SERVE_MAX_UPLOAD_BYTES", 16)
+    image_path.write_bytes(bytes(64))
+    with pytest.raises(RuntimeError, match="over 16 bytes"):
+        client.request_match(image_path, url)
+
+    # Check unknown paths are not found
+    with pytest.raises(RuntimeError, match="Not found"):
+        client._request(f"{url}/unknown", bytes(8))
@@ -1,5 +1,11 @@
-from autosheet.core import distance
-from autosheet.utils import constants
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from autosheet.core import distance, glyph
+from autosheet.data import debug, tables
+from autosheet.utils import constants, paths
 
 
 def test_get_distance() -> None:
@@ -39,3 +45,138 @@ def test_get_distance() -> None:
             if j < i:
                 continue
             distance.get_distance(g1, g2)
+
+
+def test_get_distance_table() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    code_a = distance.get_code("A")
+    code_b = distance.get_code("B")
+
+    # Check the table agrees with the pairwise lookup
+    expected_distance = distance.get_distance("A", "B")
+    table = distance.get_distance_table()
+    assert table[code_a, code_b] == expected_distance
+    assert table[code_b, code_a] == expected_distance
+
+    # Check new glyphs are registered lazily
+    code_symbol = distance.get_code("#")
+    assert distance.get_code("#") == code_symbol
+    assert distance.get_distance_by_code(code_symbol, code_symbol) == 0
+
+
+def test_get_code_threads(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    monkeypatch.setattr(distance, "_CODES", None)
+    monkeypatch.setattr(distance, "_GLYPHS", None)
+    monkeypatch.setattr(distance, "_TABLE", None)
+    glyphs = [chr(0x4E00 + i) for i in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        codes = list(executor.map(distance.get_code, glyphs + glyphs))
+
+    # Check concurrent threads build one table and give every glyph a single code
+    assert codes[: len(glyphs)] == codes[len(glyphs) :]
+    assert len(set(codes)) == len(glyphs)
+    assert all(distance._GLYPHS[code] == g for g, code in zip(glyphs, codes))
+    assert distance.get_distance_table().shape[0] >= max(codes) + 1
+
+
+def test_warm_distance_table() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    glyphs = ["", "A", "B", "8", "a", "%"]
+    table = distance.warm_distance_table(glyphs)
+
+    # Check the batch distances match the pairwise distances
+    for g1 in glyphs:
+        for g2 in glyphs:
+            code_1 = distance.get_code(g1)
+            code_2 = distance.get_code(g2)
+            expected_distance = distance._compute_distance(
+                g1, glyph.get_glyph_mask(g1), g2, glyph.get_glyph_mask(g2)
+            )
+            assert table[code_1, code_2] == expected_distance
+            assert distance.get_distance(g1, g2) == expected_distance
+
+
+def test_aggregate_distances(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    font_distances = np.array([[[0.0, 4.0], [4.0, 0.0]], [[0.0, 2.0], [2.0, 0.0]]])
+
+    # Check the tables of the fonts are aggregated as selected
+    monkeypatch.setattr(constants, "DISTANCE_TABLE", "min")
+    assert np.array_equal(distance._aggregate_distances(font_distances), font_distances[1])
+    monkeypatch.setattr(constants, "DISTANCE_TABLE", "mean")
+    assert np.array_equal(distance._aggregate_distances(font_distances), [[0, 3], [3, 0]])
+    monkeypatch.setattr(constants, "DISTANCE_TABLE", constants.FONT_NAME)
+    assert np.array_equal(distance._aggregate_distances(font_distances), font_distances[0])
+
+
+def test_build_font_tables(tmp_path, monkeypatch) -> None:
+    # Skip the debug images, every pair of glyphs would be saved
+    monkeypatch.setattr(constants, "DEBUG", False)
+
+    # Build small tables in a temporary folder, with a copy of the font as a second font
+    monkeypatch.setattr(constants, "DISTANCE_LEVEL", 3)
+    monkeypatch.setattr(paths, "TABLES_FOLDER", tmp_path / "tables")
+    monkeypatch.setattr(paths, "RESOURCES_FOLDER", tmp_path)
+    shutil.copy(paths.get_path(paths.FONT_FILE), tmp_path / "copy.ttf")
+    font_names = [constants.FONT_NAME, "copy.ttf"]
+
+    # Check the missing tables are built in parallel and saved
+    font_tables = distance.build_font_tables(font_names, workers=2)
+    size = len(constants.ALPHABET) + 1
+    assert font_tables[constants.FONT_NAME].shape == (size, size)
+    assert np.array_equal(font_tables[constants.FONT_NAME], font_tables["copy.ttf"])
+    assert len(list(paths.TABLES_FOLDER.glob("*.npy"))) == 2
+
+    # Check only the missing table of a new font is built
+    shutil.copy(tmp_path / "copy.ttf", tmp_path / "other.ttf")
+    built = []
+    compile_font_table = distance._compile_font_table
+    monkeypatch.setattr(
+        distance,
+        "_compile_font_table",
+        lambda *args: built.append(args[0]) or compile_font_table(*args),
+    )
+    font_tables = distance.build_font_tables(font_names + ["other.ttf"])
+    assert built == ["other.ttf"]
+    assert np.array_equal(font_tables["other.ttf"], font_tables["copy.ttf"])
+
+    # Check a table compiled with other rendering settings is not loaded
+    monkeypatch.setattr(constants, "BLUR_RADIUS", constants.BLUR_RADIUS * 2)
+    assert tables.load_table("copy.ttf", constants.DISTANCE_LEVEL, constants.DISTANCE_DTYPE) is None
+
+
+def test_build_font_tables_debug(tmp_path, monkeypatch) -> None:
+    # Set debug mode to True, keeping few of the pair images and waiting for room to save them
+    monkeypatch.setattr(constants, "DEBUG", True)
+    monkeypatch.setattr(constants, "DEBUG_DROP", False)
+    monkeypatch.setattr(constants, "DEBUG_SAMPLING", 100)
+    monkeypatch.setattr(paths, "DEBUG_DISTANCED_FOLDER", tmp_path / "distanced")
+    paths.DEBUG_DISTANCED_FOLDER.mkdir()
+
+    # Build small tables in a temporary folder, with copies of the font as the fonts
+    monkeypatch.setattr(constants, "DISTANCE_LEVEL", 3)
+    monkeypatch.setattr(paths, "TABLES_FOLDER", tmp_path / "tables")
+    monkeypatch.setattr(paths, "RESOURCES_FOLDER", tmp_path)
+    shutil.copy(paths.get_path(paths.FONT_FILE), tmp_path / "first.ttf")
+    shutil.copy(paths.get_path(paths.FONT_FILE), tmp_path / "second.ttf")
+
+    # Start testing with the debug writer of this process started before the workers fork
+    debug.save_debug_image(tmp_path / "parent.png", np.zeros((8, 8), dtype=np.uint8))
+    font_tables = distance.build_font_tables(["first.ttf", "second.ttf"], workers=2)
+
+    # Check the workers save their own pair images
+    assert sorted(font_tables) == ["first.ttf", "second.ttf"]
+    assert len(list(paths.DEBUG_DISTANCED_FOLDER.glob("*.png"))) > 0
@@ -1,4 +1,7 @@
+import numpy as np
+
 from autosheet.core import glyph
+from autosheet.data import atlas
 from autosheet.utils import chars, constants, paths
 
 
@@ -21,3 +24,34 @@ def test_get_glyph_mask() -> None:
             paths.GLYPHS_FOLDER / f"{chars.get_safe_name(test_glyph)}.{constants.IMAGE_FORMAT}"
         )
     ).exists()
+
+
+def test_get_glyph_mask_atlas(tmp_path, monkeypatch) -> None:
+    # Keep the atlas in a temporary folder
+    monkeypatch.setattr(paths, "GLYPHS_FOLDER", tmp_path / "glyphs")
+    monkeypatch.setattr(paths, "GLYPH_ATLAS_FILE", tmp_path / "glyphs.npy")
+    monkeypatch.setattr(paths, "GLYPH_CODES_FILE", tmp_path / "glyph-codes.npy")
+    monkeypatch.setattr(paths, "GLYPH_META_FILE", tmp_path / "glyphs.json")
+    paths.GLYPHS_FOLDER.mkdir()
+    atlas.load_atlas()
+    glyph._MASKS.clear()
+
+    # Start testing
+    test_glyph = "B"
+    mask = glyph.get_glyph_mask(test_glyph)
+    atlas.save_atlas()
+
+    # Check the atlas is saved
+    assert paths.get_path(paths.GLYPH_ATLAS_FILE).exists()
+    assert paths.get_path(paths.GLYPH_CODES_FILE).exists()
+
+    # Check the mask is loaded back from the mapped atlas
+    glyph._MASKS.clear()
+    atlas.load_atlas()
+    assert np.array_equal(glyph.get_glyph_mask(test_glyph), mask)
+    assert isinstance(atlas.get_atlas_mask(ord(test_glyph)), np.memmap)
+
+    # Map the atlas of the cache again
+    glyph._MASKS.clear()
+    monkeypatch.undo()
+    atlas.load_atlas()
@@ -0,0 +1,50 @@
+import pytest
+
+from autosheet.core import index
+from autosheet.data import pdfs
+from autosheet.utils import constants
+
+
+@pytest.fixture(autouse=True)
+def fresh_index(monkeypatch):
+    # Build a new index in every test and restore the shared one afterwards
+    monkeypatch.setattr(index, "_NAMES", None)
+    monkeypatch.setattr(index, "_POSITIONS", {})
+    monkeypatch.setattr(index, "_NGRAMS", None)
+    monkeypatch.setattr(pdfs, "_LISTENERS", [])
+
+
+def test_get_candidates() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    names = pdfs.get_pdf_names()
+
+    # Check small catalogs are not pruned
+    assert index.get_candidates("74LS0O") == names
+
+    # Check the best sharing names are kept in catalog order
+    candidates = index.get_candidates("xx151x", limit=2)
+    assert len(candidates) == 2
+    assert "74LS151" in candidates
+    assert candidates == [name for name in names if name in candidates]
+
+
+def test_update_index() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    names = pdfs.get_pdf_names()
+    index.get_candidates("74LS0O")
+
+    # Check added names are indexed at the end and removed names are dropped
+    index.update_index(["74HC595"], ["74LS151"])
+    candidates = index.get_candidates("74HC595")
+    assert candidates[-1] == "74HC595"
+    assert "74LS151" not in candidates
+
+    # Check the removed name is indexed again
+    index.update_index(["74LS151"], ["74HC595"])
+    assert sorted(index.get_candidates("74LS0O")) == sorted(names)
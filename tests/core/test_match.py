@@ -1,4 +1,7 @@
+import numpy as np
+
 from autosheet.core import match
+from autosheet.data import pdfs
 from autosheet.utils import constants
 
 
@@ -21,3 +24,105 @@ def test_get_match() -> None:
     # Exact length
     test_subject = "XXLSB64"
     assert match.get_match(test_subject)[0] == "74LS86A"
+
+
+def test_compute_weighted_levenshtein() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_pairs = [
+        ("74LS0O", "74LS00"),
+        ("74L5IAXXXXXX", "74LS14"),
+        ("7AXX151", "74LS151"),
+        ("", "74LS32"),
+        ("74LS32", ""),
+        ("", ""),
+    ]
+
+    # Check the vectorized kernel matches the reference implementation
+    for subject, target in test_pairs:
+        assert match._compute_weighted_levenshtein(
+            subject, target
+        ) == match._compute_levenshtein_distance(subject, target)
+
+
+def test_compute_min_distance() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_pairs = [("XX74LS0XX8XX", "74LS08"), ("74LS151", "XX7LS15X")]
+
+    for subject, target in test_pairs:
+        # Check the single pass matches the best substring alignment
+        longer, shorter = max(subject, target, key=len), min(subject, target, key=len)
+        expected_distance = min(
+            match._compute_levenshtein_distance(longer[i:j], shorter)
+            for i in range(len(longer) + 1)
+            for j in range(i, len(longer) + 1)
+        )
+        assert match._compute_min_distance(subject, target) == expected_distance
+
+        # Check the windowed matching never beats the single pass
+        assert match._compute_min_distance(subject, target, windowed=True) >= expected_distance
+
+
+def test_get_match_pruned() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_subjects = ["74LS0B", "XX74L532", "7LS7", "NO MATCH HERE"]
+    names = pdfs.get_pdf_names()
+
+    # Check the pruned search finds the same best target as a full scan
+    for subject in test_subjects:
+        expected_distances = [match._compute_min_distance(subject, name) for name in names]
+        expected_distance = min(expected_distances)
+        expected_target = names[expected_distances.index(expected_distance)]
+        assert match.get_match(subject) == (expected_target, expected_distance)
+
+
+def test_get_match_normalized() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Check whitespace and case do not change the match
+    assert match.get_match(" 74ls 0o\n") == match.get_match("74LS0O")
+
+
+def test_get_ranked_matches() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_subjects = ["74LS0B", "XX74L532", "7LS7"]
+    names = pdfs.get_pdf_names()
+
+    # Check the pruned ranking has the best distances of a full scan
+    for subject in test_subjects:
+        distances = {name: match._compute_min_distance(subject, name) for name in names}
+        ranked_matches = match.get_ranked_matches(subject, 3)
+        assert [d for _, d in ranked_matches] == sorted(distances.values())[:3]
+        assert all(distances[target] == d for target, d in ranked_matches)
+        assert match.get_ranked_matches(subject, 1) == [match.get_match(subject)]
+
+
+def test_compute_band_threshold() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Check rounding does not narrow the band, 0.6 / 0.1 is just below 6 in floating point
+    indel_costs = np.full(3, 0.1)
+    assert match._compute_band(3, 3, indel_costs, indel_costs, 0.6) == (-3, 3)
+    assert match._compute_band(3, 6, indel_costs, np.full(6, 0.1), 0.2) is None
+
+    # Check alignments exactly on the threshold are kept
+    test_pairs = [("74LS0O", "74LS00"), ("7AXX151", "74LS151"), ("XXLSB64", "74LS86A")]
+    for subject, target in test_pairs:
+        expected_distance = match._compute_weighted_levenshtein(subject, target)
+        assert (
+            match._compute_weighted_levenshtein(subject, target, threshold=expected_distance)
+            == expected_distance
+        )
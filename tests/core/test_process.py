@@ -11,3 +11,17 @@ def test_get_processed():
     test_image = Image.open("data/images/1.png")
     process.get_processed("1", test_image)
     assert True
+
+
+def test_get_processed_profiles():
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_image = Image.open("data/images/1.png")
+    processed_images = [
+        process.get_processed("1", test_image, profile) for profile in constants.PROCESS_PROFILES
+    ]
+
+    # Check every profile keeps the size of the processed image
+    assert all(image.shape == processed_images[0].shape for image in processed_images)
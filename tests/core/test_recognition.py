@@ -15,3 +15,34 @@ def test_get_recognition():
         np.array(test_raw_image), test_processed_image
     )
     assert len(raw_result) > 0 and len(processed_result) > 0
+
+
+def test_warm_up():
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    recognition.warm_up()
+
+    # Check the reader is reused instead of created again
+    with recognition._borrow_reader() as first_reader:
+        pass
+    with recognition._borrow_reader() as second_reader:
+        pass
+    assert first_reader is second_reader
+
+
+def test_get_recognitions():
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    test_raw_image = np.array(Image.open("data/images/1.png"))
+    test_processed_image = process.get_processed("1", Image.open("data/images/1.png"))
+    test_images = [test_processed_image, test_raw_image, test_processed_image]
+    results = recognition.get_recognitions(test_images, batch_size=2)
+
+    # Check the results keep the order of the images
+    assert len(results) == 3
+    assert results[0] == results[2]
+    assert results[1] == recognition.get_recognition(test_raw_image, test_processed_image)[0]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from autosheet.data import atlas
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    # Keep the atlas of every test in its own folder
+    monkeypatch.setattr(paths, "GLYPHS_FOLDER", tmp_path / "glyphs")
+    monkeypatch.setattr(paths, "GLYPH_ATLAS_FILE", tmp_path / "glyphs.npy")
+    monkeypatch.setattr(paths, "GLYPH_CODES_FILE", tmp_path / "glyph-codes.npy")
+    monkeypatch.setattr(paths, "GLYPH_META_FILE", tmp_path / "glyphs.json")
+    paths.GLYPHS_FOLDER.mkdir()
+    atlas.load_atlas()
+    yield tmp_path
+
+    # Map the atlas of the cache again
+    monkeypatch.undo()
+    atlas.load_atlas()
+
+
+def test_add_atlas_mask() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    code = ord("B")
+    mask = np.full((constants.CANVAS_SIZE, constants.CANVAS_SIZE), 128, dtype=np.uint8)
+    assert atlas.get_atlas_mask(code) is None
+
+    # Check an added mask is available before it is saved
+    atlas.add_atlas_mask(code, mask)
+    assert np.array_equal(atlas.get_atlas_mask(code), mask)
+
+    # Check the saved mask is mapped back from the file
+    atlas.flush_atlas()
+    atlas.load_atlas()
+    assert isinstance(atlas.get_atlas_mask(code), np.memmap)
+    assert np.array_equal(atlas.get_atlas_mask(code), mask)
+
+    # Check a mask that was not saved is dropped on reload
+    atlas.add_atlas_mask(ord("C"), mask)
+    atlas.load_atlas()
+    assert atlas.get_atlas_mask(ord("C")) is None
+
+
+def test_load_atlas_stale(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    code = ord("B")
+    mask = np.zeros((constants.CANVAS_SIZE, constants.CANVAS_SIZE), dtype=np.uint8)
+    atlas.add_atlas_mask(code, mask)
+    atlas.save_atlas()
+    glyph_path = paths.GLYPHS_FOLDER / f"B_66.{constants.IMAGE_FORMAT}"
+    glyph_path.touch()
+
+    # Check the atlas and the rendered glyphs are dropped once the rendering settings change
+    monkeypatch.setattr(constants, "BLUR_RADIUS", constants.BLUR_RADIUS * 2)
+    atlas.load_atlas()
+    assert atlas.get_atlas_mask(code) is None
+    assert not glyph_path.exists()
@@ -0,0 +1,24 @@
+import numpy as np
+
+from autosheet.data import debug
+from autosheet.utils import constants
+
+
+def test_get_debug_stats(tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing after the images queued by other tests are saved
+    debug.flush_debug_images()
+    stats = debug.get_debug_stats()
+    image = np.zeros((8, 8), dtype=np.uint8)
+    for i in range(4):
+        debug.save_debug_image(tmp_path / f"{i}.png", image, sampling=2)
+    debug.save_debug_image(tmp_path / "missing" / "0.png", image)
+    debug.flush_debug_images()
+
+    # Check every other image is saved and the one without a folder is counted as failed
+    new_stats = debug.get_debug_stats()
+    assert new_stats["saved"] - stats["saved"] == 2
+    assert new_stats["failed"] - stats["failed"] == 1
+    assert sorted(path.name for path in tmp_path.glob("*.png")) == ["0.png", "2.png"]
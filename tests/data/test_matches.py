@@ -0,0 +1,30 @@
+import pytest
+
+from autosheet.data import matches
+from autosheet.data.models.Match import Match
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture(autouse=True)
+def match_store(tmp_path, monkeypatch):
+    # Keep the matches of every test in their own store
+    monkeypatch.setattr(paths, "MATCHES_DB", tmp_path / "matches.sqlite")
+    monkeypatch.setattr(matches, "_STORE", None)
+
+
+def test_get_matches_settings(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    matches.add_matches("74LS0O", [Match("74LS00", 1.0)])
+    matches.save_matches()
+
+    # Check the matches are kept across restarts with the same settings
+    monkeypatch.setattr(matches, "_STORE", None)
+    assert [m.target for m in matches.get_matches("74LS0O")] == ["74LS00"]
+
+    # Check the matches are dropped once the matching mode changes
+    monkeypatch.setattr(matches, "_STORE", None)
+    monkeypatch.setattr(constants, "WINDOWED_MATCHING", not constants.WINDOWED_MATCHING)
+    assert matches.get_matches("74LS0O") == []
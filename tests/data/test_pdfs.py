@@ -0,0 +1,57 @@
+import pytest
+
+from autosheet.data import matches, pdfs
+from autosheet.data.models.Match import Match
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture(autouse=True)
+def pdfs_folder(tmp_path, monkeypatch):
+    # Keep the catalog and the matches of every test in the temporary folder
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    for name in ["74LS00", "74LS02", "74LS08"]:
+        (folder / f"{name}.pdf").touch()
+    monkeypatch.setattr(paths, "PDFS_FOLDER", folder)
+    monkeypatch.setattr(paths, "MATCHES_DB", tmp_path / "matches.sqlite")
+    monkeypatch.setattr(pdfs, "_PDF_NAMES", None)
+    monkeypatch.setattr(pdfs, "_FINGERPRINT", None)
+    monkeypatch.setattr(pdfs, "_LISTENERS", [])
+    monkeypatch.setattr(matches, "_STORE", None)
+    return folder
+
+
+def test_refresh_pdf_names(pdfs_folder) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    changes = []
+    pdfs.add_pdf_listener(lambda added, removed: changes.append((added, removed)))
+    names = pdfs.get_pdf_names()
+    fingerprint = pdfs.get_pdf_fingerprint()
+
+    # Check nothing changes while the folder does not
+    assert pdfs.refresh_pdf_names() == ([], [])
+    assert changes == []
+
+    # Check added names go to the end, removed names are dropped and listeners follow
+    (pdfs_folder / "74LS02.pdf").unlink()
+    (pdfs_folder / "74HC595.pdf").touch()
+    assert pdfs.refresh_pdf_names() == (["74HC595"], ["74LS02"])
+    assert changes == [(["74HC595"], ["74LS02"])]
+    assert pdfs.get_pdf_names() == [n for n in names if n != "74LS02"] + ["74HC595"]
+    assert pdfs.get_pdf_fingerprint() != fingerprint
+
+
+def test_prune_matches(pdfs_folder) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    matches.add_matches("74LS0O", [Match("74LS00", 1.0), Match("74LS02", 2.0)])
+
+    # Check the matches with a datasheet removed while watched are pruned
+    (pdfs_folder / "74LS02.pdf").unlink()
+    pdfs.refresh_pdf_names()
+    assert [m.target for m in matches.get_matches("74LS0O")] == ["74LS00"]
@@ -0,0 +1,105 @@
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from autosheet.data import image, results
+from autosheet.utils import constants, paths
+
+
+@pytest.fixture(autouse=True)
+def cache_folder(tmp_path, monkeypatch):
+    # Keep the cache of every test in its own folder
+    monkeypatch.setattr(paths, "RESULTS_FOLDER", tmp_path / "results")
+    monkeypatch.setattr(paths, "RESULTS_FILE", tmp_path / "results.json")
+    monkeypatch.setattr(paths, "IMAGES_FOLDER", tmp_path / "images")
+    monkeypatch.setattr(results, "_RESULTS", None)
+    monkeypatch.setattr(image, "_IMAGE_HASHES", None)
+    return tmp_path
+
+
+def save_image(path, seed: int) -> None:
+    pixels = np.random.default_rng(seed).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+
+def test_get_result(cache_folder) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    save_image(cache_folder / "first.png", 0)
+    shutil.copy(cache_folder / "first.png", cache_folder / "second.png")
+    key = results.get_key(image.get_image_hash(cache_folder / "first.png"))
+    results.add_result(key, np.zeros((8, 8), dtype=np.uint8), "74LS0O", "74LS00", "74LS00")
+
+    # Check the same image saved again hits the cache, also after a restart
+    second_key = results.get_key(image.get_image_hash(cache_folder / "second.png"))
+    assert results.get_result(second_key).datasheet == "74LS00"
+    results.save_results()
+    results._RESULTS = None
+    result = results.get_result(second_key)
+    assert (result.raw_text, result.processed_text) == ("74LS0O", "74LS00")
+    assert (paths.RESULTS_FOLDER / result.image).exists()
+
+
+def test_get_result_config(cache_folder, monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    save_image(cache_folder / "first.png", 0)
+    image_hash = image.get_image_hash(cache_folder / "first.png")
+    results.add_result(results.get_key(image_hash), np.zeros((8, 8), dtype=np.uint8), "", "", "A")
+
+    # Check a setting affecting the result misses the cache
+    monkeypatch.setattr(constants, "PROCESS_PROFILE", "fast")
+    assert results.get_result(results.get_key(image_hash)) is None
+
+    # Check a change of the matching mode misses the cache too
+    monkeypatch.setattr(constants, "PROCESS_PROFILE", "accurate")
+    results.add_result(results.get_key(image_hash), np.zeros((8, 8), dtype=np.uint8), "", "", "A")
+    monkeypatch.setattr(constants, "MATCHING_VERSION", constants.MATCHING_VERSION + 1)
+    assert results.get_result(results.get_key(image_hash)) is None
+
+
+def test_add_result_eviction(monkeypatch) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    processed_image = np.zeros((8, 8), dtype=np.uint8)
+    first = results.add_result("first", processed_image, "", "", "A")
+    monkeypatch.setattr(constants, "RESULTS_CACHE_BYTES", 2 * first.size)
+    results.add_result("second", processed_image, "", "", "B")
+
+    # Check the least recently used result is evicted along with its image
+    assert results.get_result("first") is not None
+    results.add_result("third", processed_image, "", "", "C")
+    assert results.get_result("second") is None
+    assert not (paths.RESULTS_FOLDER / "second.png").exists()
+    assert list(results.get_results()) == ["first", "third"]
+
+
+def test_copy_image(cache_folder) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    paths.IMAGES_FOLDER.mkdir()
+    save_image(paths.IMAGES_FOLDER / "1.png", 0)
+    save_image(cache_folder / "new.png", 1)
+    shutil.copy(cache_folder / "new.png", cache_folder / "same.png")
+    save_image(cache_folder / "other.png", 2)
+
+    # Check identical images are stored once and other images get the next number
+    assert image.copy_image(cache_folder / "new.png")[0] == "2"
+    assert image.copy_image(cache_folder / "same.png")[0] == "2"
+    assert image.copy_image(cache_folder / "other.png")[0] == "3"
+    assert image.copy_image(paths.IMAGES_FOLDER / "1.png")[0] == "1"
+    assert sorted(path.name for path in paths.IMAGES_FOLDER.iterdir()) == [
+        "1.png",
+        "2.png",
+        "3.png",
+    ]
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from autosheet.data.store import Store
+from autosheet.utils import constants
+
+
+@pytest.fixture
+def store(tmp_path):
+    # Open a new store in the temporary folder
+    return Store(tmp_path / "store.sqlite")
+
+
+def test_add_pairs(store) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    store.add_pairs([("a", "b", 1.0), ("a", "c", 2), ("b", "c", 3.0)])
+    store.add_pairs([("a", "b", 4.0)])
+
+    # Check the pairs are looked up by subject and replaced when added again
+    assert sorted(store.get_targets("a")) == [("b", 4.0), ("c", 2.0)]
+    assert store.get_targets("c") == []
+    assert store.get_distance("b", "c") == 3.0
+    assert store.get_distance("c", "b") is None
+    assert sorted(store.get_subjects()) == ["a", "b"]
+    assert sorted(store.get_pairs()) == [("a", "b", 4.0), ("a", "c", 2.0), ("b", "c", 3.0)]
+
+
+def test_remove_pairs(store) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    store.add_pairs([("a", "b", 1.0), ("a", "c", 2.0), ("b", "c", 3.0), ("c", "d", 4.0)])
+
+    # Check the pairs of removed subjects and of targets that are not kept are removed
+    assert store.remove_subjects(["c", "e"]) == 1
+    assert store.keep_targets(["b", "d"]) == 2
+    assert store.get_pairs() == [("a", "b", 1.0)]
+
+    # Check clearing removes every pair
+    store.clear()
+    assert store.get_pairs() == []
+
+
+def test_meta(store, tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    assert store.get_meta("settings") is None
+    store.set_meta("settings", "a")
+    store.set_meta("settings", "b")
+
+    # Check the values are replaced and kept across restarts, like the committed pairs
+    store.add_pairs([("a", "b", 1.0)])
+    store.save()
+    reopened = Store(tmp_path / "store.sqlite")
+    assert reopened.get_meta("settings") == "b"
+    assert reopened.get_pairs() == [("a", "b", 1.0)]
+
+
+def test_import_json(tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    json_path = tmp_path / "store.json"
+    json_path.write_text(json.dumps({"a": [{"target": "b", "distance": 1}]}))
+    store = Store(tmp_path / "store.sqlite", json_path)
+
+    # Check the JSON cache is imported when the store is created
+    assert store.get_targets("a") == [("b", 1.0)]
+
+    # Check it is not imported again once the store exists
+    store.clear()
+    store.save()
+    assert Store(tmp_path / "store.sqlite", json_path).get_pairs() == []
@@ -0,0 +1,111 @@
+import json
+import threading
+import tracemalloc
+
+import pytest
+
+from autosheet.utils import constants, profiling
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    # Profile every test from a clean slate and stop tracing memory afterwards
+    monkeypatch.setattr(constants, "PROFILE", False)
+    profiling.pop_records()
+    profiling.enable()
+    yield
+    tracemalloc.stop()
+    profiling.pop_records()
+
+
+@profiling.profiled("test.add")
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def test_profiled() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Check each call is recorded under the name
+    assert add(1, 2) == 3
+    records = profiling.pop_records()
+    assert [record["name"] for record in records] == ["test.add"]
+    assert records[0]["wall"] >= 0 and records[0]["cpu"] >= 0
+
+    # Check nothing is recorded once profiling is disabled
+    constants.PROFILE = False
+    assert add(1, 2) == 3
+    with profiling.profile("test.block"):
+        pass
+    assert profiling.pop_records() == []
+
+
+def test_profile_peak_memory() -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Check a nested block does not erase the peak its parent reached before it
+    with profiling.profile("test.outer"):
+        data = bytearray(4 * 1024 * 1024)
+        del data
+        with profiling.profile("test.inner"):
+            pass
+    peaks = {record["name"]: record["peak_memory"] for record in profiling.pop_records()}
+    assert peaks["test.outer"] >= 3 * 1024 * 1024
+    assert peaks["test.inner"] < 3 * 1024 * 1024
+
+    # Check a block on another thread does not erase it either
+    started = threading.Event()
+    finished = threading.Event()
+
+    def other() -> None:
+        started.wait()
+        with profiling.profile("test.other"):
+            pass
+        finished.set()
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    with profiling.profile("test.main"):
+        data = bytearray(4 * 1024 * 1024)
+        del data
+        started.set()
+        finished.wait()
+    thread.join()
+    peaks = {record["name"]: record["peak_memory"] for record in profiling.pop_records()}
+    assert peaks["test.main"] >= 3 * 1024 * 1024
+
+
+def test_save_records(tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    add(1, 2)
+    profiling.save_records(tmp_path / "trace.json")
+
+    # Check the records are saved as a JSON list
+    with open(tmp_path / "trace.json") as f:
+        records = json.load(f)
+    assert [record["name"] for record in records] == ["test.add"]
+    assert set(records[0]) == {"name", "start", "wall", "cpu", "peak_memory", "pid", "tid"}
+
+
+def test_save_chrome_trace(tmp_path) -> None:
+    # Set debug mode to True
+    constants.DEBUG = True
+
+    # Start testing
+    add(1, 2)
+    record = profiling.get_records()[0]
+    profiling.save_chrome_trace(tmp_path / "trace.json")
+
+    # Check the records are saved as complete events in microseconds
+    with open(tmp_path / "trace.json") as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == 1
+    assert events[0]["name"] == "test.add" and events[0]["ph"] == "X"
+    assert events[0]["ts"] == pytest.approx(record["start"] * 1e6)
+    assert events[0]["dur"] == pytest.approx(record["wall"] * 1e6)
+    assert events[0]["args"]["peak_memory"] == record["peak_memory"]
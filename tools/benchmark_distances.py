@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+from autosheet.core import distance, glyph
+from autosheet.utils import constants
+
+# The empty glyph and the supported alphabet, as in distance.warm_distance_table
+GLYPHS = [""] + list(constants.ALPHABET)
+
+# Pyramid levels to compare, level 0 being the full canvas
+LEVELS = [0, 1, 2, 3]
+
+
+def get_ranks(matrix: np.ndarray) -> np.ndarray:
+    """
+    Get the rank of every distance within its row.
+    """
+    return matrix.argsort(axis=1, kind="stable").argsort(axis=1, kind="stable")
+
+
+def get_rank_correlation(matrix: np.ndarray, reference: np.ndarray) -> float:
+    """
+    Get the mean Spearman correlation between the rows of the matrix and the reference.
+    """
+    ranks = get_ranks(matrix).astype(float)
+    reference_ranks = get_ranks(reference).astype(float)
+    ranks -= ranks.mean(axis=1, keepdims=True)
+    reference_ranks -= reference_ranks.mean(axis=1, keepdims=True)
+    correlations = (ranks * reference_ranks).sum(axis=1) / np.sqrt(
+        (ranks**2).sum(axis=1) * (reference_ranks**2).sum(axis=1)
+    )
+    return correlations.mean()
+
+
+def get_nearest(matrix: np.ndarray, k: int) -> list[set[int]]:
+    """
+    Get the k nearest other glyphs of every glyph.
+    """
+    matrix = matrix + np.diag(np.full(len(matrix), np.inf))
+    return [set(row) for row in matrix.argsort(axis=1, kind="stable")[:, :k]]
+
+
+def get_nearest_agreement(matrix: np.ndarray, reference: np.ndarray, k: int) -> float:
+    """
+    Get the share of the k nearest glyphs that are also the k nearest in the reference.
+    """
+    nearest = get_nearest(matrix, k)
+    reference_nearest = get_nearest(reference, k)
+    return np.mean([len(a & b) / k for a, b in zip(nearest, reference_nearest)])
+
+
+# Compute the full-resolution table as the reference
+reference = distance._compute_distance_matrix(
+    GLYPHS, glyph.get_distance_masks(GLYPHS, 0, "float64")
+)
+
+print(
+    f"{'size':>7} {'dtype':<8} {'masks':>10} {'build':>10} {'spearman':>9} "
+    f"{'top-1':>6} {'top-3':>6} {'max error':>10}"
+)
+for level in LEVELS:
+    for dtype in constants.DISTANCE_DTYPES:
+        # Reduce the masks and compute the table from them
+        masks = glyph.get_distance_masks(GLYPHS, level, dtype)
+        started_at = time.perf_counter()
+        matrix = distance._compute_distance_matrix(GLYPHS, masks)
+        elapsed = time.perf_counter() - started_at
+
+        # Compare the ranking of every row with the full-resolution one
+        error = np.abs(matrix - reference).max() / reference.max()
+        size = constants.CANVAS_SIZE >> level
+        print(
+            f"{size:>3}x{size:<3} {dtype:<8} {masks.nbytes / 1024:>7.0f} KB "
+            f"{elapsed * 1000:>7.1f} ms {get_rank_correlation(matrix, reference):>9.4f} "
+            f"{get_nearest_agreement(matrix, reference, 1):>6.1%} "
+            f"{get_nearest_agreement(matrix, reference, 3):>6.1%} {error:>10.2%}"
+        )
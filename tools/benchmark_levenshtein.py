@@ -0,0 +1,44 @@
+import random
+import timeit
+
+from autosheet.core import distance, match
+from autosheet.utils import constants
+
+# Benchmark settings
+LENGTHS = [6, 12, 30]
+REPEATS = 20
+
+# Warm the glyph distance table so both kernels only measure the DP
+distance.warm_distance_table()
+
+# Generate random subject and target strings for each length
+random.seed(0)
+alphabet = constants.ALPHABET
+cases = [
+    (
+        "".join(random.choices(alphabet, k=length)),
+        "".join(random.choices(alphabet, k=length)),
+    )
+    for length in LENGTHS
+]
+
+# Print the header
+print(f"{'Length':>8} {'Reference (ms)':>16} {'Vectorized (ms)':>16} {'Speedup':>8}")
+
+# Time both kernels on every case
+for subject, target in cases:
+    reference_result = match._compute_levenshtein_distance(subject, target)
+    vectorized_result = match._compute_weighted_levenshtein(subject, target)
+    assert reference_result == vectorized_result
+
+    reference_time = timeit.timeit(
+        lambda: match._compute_levenshtein_distance(subject, target), number=REPEATS
+    )
+    vectorized_time = timeit.timeit(
+        lambda: match._compute_weighted_levenshtein(subject, target), number=REPEATS
+    )
+
+    print(
+        f"{len(subject):>8} {reference_time / REPEATS * 1000:>16.3f}"
+        f" {vectorized_time / REPEATS * 1000:>16.3f} {reference_time / vectorized_time:>7.1f}x"
+    )
@@ -0,0 +1,64 @@
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from autosheet.app import operations
+from autosheet.core import process, recognition
+from autosheet.utils import constants
+
+# Expected datasheet for each image in data/images
+LABELS = {
+    "1": "74LS00",
+    "2": "74LS02",
+    "3": "74LS08",
+    "4": "74LS14",
+    "8": "74LS86A",
+}
+
+# The preprocessing steps in the order of process.get_processed
+STEPS = [
+    ("resize", lambda image, _: process._resize_image(image)),
+    ("grayscale", lambda image, _: process._grayscale_image(image)),
+    ("gamma", lambda image, _: process._gamma_adjust_image(image)),
+    ("clahe", lambda image, _: process._clahe_enhance_image(image)),
+    ("denoise", lambda image, profile: process._denoise_image(image, profile)),
+    ("invert", lambda image, _: process._invert_image(image)),
+    ("binarize", lambda image, _: process._binarize_image(image)),
+    ("clean", lambda image, _: process._clean_image(image)),
+    ("deskew", lambda image, _: process._deskew_image(image)),
+]
+
+# Load the labelled images
+images = {
+    name: Image.open(next(Path("data/images").glob(f"{name}.*"))).convert("RGB") for name in LABELS
+}
+
+# Load the OCR models before timing anything
+recognition.warm_up()
+
+for profile in constants.PROCESS_PROFILES:
+    step_times = {step: [] for step, _ in STEPS}
+    correct = 0
+
+    for name, raw_image in images.items():
+        # Time every preprocessing step
+        image = raw_image
+        for step, function in STEPS:
+            started_at = time.perf_counter()
+            image = function(image, profile)
+            step_times[step].append(time.perf_counter() - started_at)
+
+        # Find the datasheet from the processed image
+        raw_text, processed_text = recognition.get_recognition(np.array(raw_image), image)
+        pdf_path = operations.find_datasheet(raw_text, processed_text)
+        correct += pdf_path.stem == LABELS[name]
+
+    # Print the report of the profile
+    total_time = sum(np.mean(times) for times in step_times.values())
+    print(f"Profile: {profile}")
+    for step, times in step_times.items():
+        print(f"  {step:<10} {np.mean(times) * 1000:>9.2f} ms")
+    print(f"  {'total':<10} {total_time * 1000:>9.2f} ms")
+    print(f"  accuracy   {correct}/{len(images)}")
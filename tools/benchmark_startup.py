@@ -0,0 +1,65 @@
+import re
+import subprocess
+import sys
+import time
+
+# Modules whose import time is tracked, from the entry point to the heavy operations
+MODULES = [
+    "autosheet.main",
+    "autosheet.app.Window",
+    "autosheet.app.batch",
+    "autosheet.app.operations",
+]
+
+# Number of cold starts to average the wall time over
+RUNS = 5
+
+# Number of the slowest packages to list per module
+TOP = 10
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s*(\S+)")
+
+
+def get_import_times(module: str) -> tuple[float, int, dict[str, int]]:
+    """
+    Import the module in a fresh interpreter with -X importtime. Returns the wall time of the
+    run, the cumulative import time of the module and the time spent importing each top-level
+    package, in microseconds.
+    """
+    started_at = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - started_at
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    # Sum the own import time of every module by its top-level package
+    module_time = 0
+    package_times = {}
+    for line in completed.stderr.splitlines():
+        match = LINE.match(line)
+        if match is None:
+            continue
+        name = match.group(3)
+        package = name.split(".")[0]
+        package_times[package] = package_times.get(package, 0) + int(match.group(1))
+        if name == module:
+            module_time = int(match.group(2))
+    return elapsed, module_time, package_times
+
+
+for module in MODULES:
+    try:
+        runs = [get_import_times(module) for _ in range(RUNS)]
+    except RuntimeError as e:
+        print(f"{module}: cannot be imported here ({e})")
+        continue
+
+    # Print the report of the module, using the median run
+    elapsed, module_time, package_times = sorted(runs)[RUNS // 2]
+    print(f"{module}: {module_time / 1000:.1f} ms to import, {elapsed * 1000:.1f} ms cold start")
+    for package, package_time in sorted(package_times.items(), key=lambda p: -p[1])[:TOP]:
+        print(f"  {package_time / 1000:>9.1f} ms  {package}")
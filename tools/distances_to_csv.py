@@ -1,10 +1,13 @@
 import csv
-import json
 from pathlib import Path
 
-# Load the JSON file
-with open(Path("data/cache/distances.json"), "r") as json_file:
-    data = json.load(json_file)
+from autosheet.data import distances
+
+# Load the distances from the cache
+data = {
+    subject: [d.to_dict() for d in subject_distances]
+    for subject, subject_distances in distances.get_distances().items()
+}
 
 # Convert the JSON data to a list of rows
 rows = []
@@ -1,10 +1,12 @@
 import csv
-import json
-from pathlib import Path
 
-# Load the JSON file
-with open(Path("data/cache/matches.json"), "r") as json_file:
-    data = json.load(json_file)
+from autosheet.data import matches
+
+# Load the matches from the cache
+data = {
+    subject: [m.to_dict() for m in subject_matches]
+    for subject, subject_matches in matches.get_all_matches().items()
+}
 
 # Extract the union of all target names.
 all_targets = set()